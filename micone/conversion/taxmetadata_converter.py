@@ -2,14 +2,12 @@
     Module containing methods that convert taxonomy metadata into various formats
 """
 
-import csv
 import pathlib
-from typing import Dict, List
 
 import pandas as pd
 
 from ..validation.otu_schema import ObsmetaType
-from ..main import Lineage
+from ..main import lineage_table
 
 
 def qiime2_to_default(in_file: pathlib.Path, out_file: pathlib.Path) -> None:
@@ -23,24 +21,13 @@ def qiime2_to_default(in_file: pathlib.Path, out_file: pathlib.Path) -> None:
     out_file : pathlib.Path
         The path to the default format output file
     """
-    with open(in_file, "r") as fid:
-        csv_reader = csv.reader(fid, delimiter="\t")
-        data_dict: Dict[str, List[str]] = {key: [] for key in ObsmetaType._req_keys}
-        data_dict["ID"] = []
-        header, *rest = csv_reader
-        ekey = ObsmetaType._extra_keys[0]  # the Confidence value
-        if ekey in header:
-            data_dict[ekey] = []
-        for line in rest:
-            if line[0].startswith("#q2:types"):
-                continue
-            lineage = Lineage.from_str(line[header.index("Taxon")])
-            data_dict["ID"].append(line[0])
-            for rkey in ObsmetaType._req_keys:
-                data_dict[rkey].append(getattr(lineage, rkey))
-            if ekey in data_dict:
-                data_dict[ekey].append(line[header.index(ekey)])
-    df = pd.DataFrame.from_dict(data_dict)
+    data = pd.read_csv(in_file, sep="\t", dtype=str, na_filter=False)
+    data = data[~data.iloc[:, 0].str.startswith("#q2:types")]
+    df = lineage_table.from_strs(data["Taxon"])[ObsmetaType._req_keys]
+    ekey = ObsmetaType._extra_keys[0]  # the Confidence value
+    if ekey in data.columns:
+        df[ekey] = data[ekey]
+    df.insert(0, "ID", data.iloc[:, 0])
     df.set_index("ID", inplace=True, verify_integrity=True)
     df.to_csv(out_file, index=True)
 
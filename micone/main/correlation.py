@@ -0,0 +1,430 @@
+"""
+    Module that implements vectorized correlation methods for tables of abundances
+    Each function computes the correlation between all the rows of a table, or of every
+    table in a stack of tables, with one matrix multiplication
+
+    The results are identical to computing `scipy.stats.pearsonr` or `scipy.stats.spearmanr`
+    for every pair of rows, with undefined correlations (constant rows) set to 0.0
+
+    The pvalues of the correlations are computed from bootstrap resamples that are
+    generated and correlated in memory, only the counts of the resamples with larger
+    correlations are kept
+"""
+
+import multiprocessing as mp
+import os
+import time
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy.stats import rankdata
+
+from ..logging import LOG
+
+
+def _correlate(data: np.ndarray) -> np.ndarray:
+    """
+    Compute the Pearson correlation between all the rows of the last two axes of `data`
+    The diagonal is 1.0 and the correlations of constant rows are 0.0
+    """
+    # NOTE: Constant rows are detected exactly since their centered values need not be 0
+    constant = (data == data[..., :1]).all(axis=-1)
+    centered = data - data.mean(axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        normalized = centered / np.linalg.norm(centered, axis=-1, keepdims=True)
+    normalized[constant] = np.nan
+    corr = normalized @ np.swapaxes(normalized, -1, -2)
+    np.clip(corr, -1.0, 1.0, out=corr)
+    corr[np.isnan(corr)] = 0.0
+    diagonal = np.arange(corr.shape[-1])
+    corr[..., diagonal, diagonal] = 1.0
+    return corr
+
+
+def pearson(data: np.ndarray) -> np.ndarray:
+    """
+    Compute the Pearson correlation matrix of the rows of a table
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The table with the features as rows and the samples as columns
+        A stack of tables with the shape (tables, features, samples) is also accepted
+
+    Returns
+    -------
+    np.ndarray
+        The (features, features) correlation matrix, or one matrix per table of the stack
+    """
+    return _correlate(np.array(data, dtype=float))
+
+
+def spearman(data: np.ndarray) -> np.ndarray:
+    """
+    Compute the Spearman correlation matrix of the rows of a table
+    Ties are assigned the average of their ranks
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The table with the features as rows and the samples as columns
+        A stack of tables with the shape (tables, features, samples) is also accepted
+
+    Returns
+    -------
+    np.ndarray
+        The (features, features) correlation matrix, or one matrix per table of the stack
+    """
+    return _correlate(rankdata(np.asarray(data, dtype=float), axis=-1))
+
+
+METHODS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "pearson": pearson,
+    "spearman": spearman,
+}
+
+
+def _resample_nbytes(n_rows: int, n_samples: int) -> int:
+    """
+    The approximate peak memory in bytes used by one resample of a batch
+    This is the correlation matrix with its mask and the resampled table with its
+    indices and intermediate values
+    """
+    return 9 * n_rows * n_rows + 40 * n_rows * n_samples
+
+
+def _count_extremes(
+    data: np.ndarray,
+    method: str,
+    abs_corr: np.ndarray,
+    seeds: List[np.random.SeedSequence],
+    counts: np.ndarray,
+) -> None:
+    """
+    Add the resamples of a batch whose absolute correlations are at least `abs_corr`
+    to `counts`
+    Every row of a resample is drawn independently from the samples of the row
+    """
+    n_rows, n_samples = data.shape
+    samples = np.stack(
+        [
+            np.random.default_rng(seed).integers(0, n_samples, size=(n_rows, n_samples))
+            for seed in seeds
+        ]
+    )
+    resamples = data[np.arange(n_rows)[:, np.newaxis], samples]
+    del samples
+    corr = METHODS[method](resamples)
+    del resamples
+    # NOTE: The resamples are counted one at a time to avoid a boolean copy of the batch
+    for resample_corr in corr:
+        np.abs(resample_corr, out=resample_corr)
+        counts += resample_corr >= abs_corr
+
+
+def _run_batches(
+    data: np.ndarray,
+    abs_corr: np.ndarray,
+    counts: np.ndarray,
+    method: str,
+    entropy: int,
+    batches: Iterable[Tuple[int, int]],
+) -> Tuple[int, float]:
+    """
+    Add the counts of the resamples of every (start, stop) batch to `counts`
+    The seed of resample `i` is the `i`-th child of the seed sequence with `entropy`
+
+    Returns
+    -------
+    Tuple[int, float]
+        The number of resamples and the time spent in seconds
+    """
+    n_resamples = 0
+    start_time = time.perf_counter()
+    for start, stop in batches:
+        seeds = [
+            np.random.SeedSequence(entropy, spawn_key=(i,)) for i in range(start, stop)
+        ]
+        _count_extremes(data, method, abs_corr, seeds, counts)
+        n_resamples += stop - start
+    return n_resamples, time.perf_counter() - start_time
+
+
+def _bootstrap_worker(
+    slot: int,
+    blocks: Dict[str, Tuple[str, Tuple[int, ...], str]],
+    method: str,
+    entropy: int,
+    tasks: mp.Queue,
+    results: mp.Queue,
+) -> None:
+    """
+    Worker process that adds the counts of the batches in `tasks` to its slot of the
+    shared output cube and puts its throughput in `results`
+    """
+    shms = {
+        name: shared_memory.SharedMemory(name=block[0])
+        for name, block in blocks.items()
+    }
+    try:
+        arrays = {
+            name: np.ndarray(shape, dtype=dtype, buffer=shms[name].buf)
+            for name, (_, shape, dtype) in blocks.items()
+        }
+        n_resamples, seconds = _run_batches(
+            arrays["data"],
+            arrays["abs_corr"],
+            arrays["counts"][slot],
+            method,
+            entropy,
+            iter(tasks.get, None),
+        )
+        del arrays
+        results.put((slot, os.getpid(), n_resamples, seconds))
+    finally:
+        for shm in shms.values():
+            shm.close()
+
+
+class BootstrapExecutor:
+    """
+    Executor that computes the bootstrap pvalues of correlations with a pool of processes
+    The table, the observed correlations and an output cube with one matrix of counts
+    per worker are placed in shared memory once, the workers only receive the ranges of
+    the resamples that they have to generate
+
+    Parameters
+    ----------
+    ncpus : int
+        The number of worker processes, with 1 the resamples are computed in process
+        Default value is 1
+    batch_size : int, optional
+        The largest number of resamples that are generated and correlated together
+        Default value is None which only limits the batches by `memory_budget`
+    memory_budget : int
+        The memory in bytes that the batches of resamples may use in all the workers
+        The budget is shared by the workers, each batch is made as large as the share of
+        a worker allows and holds at least one resample
+        Default value is 1073741824 (1 GiB)
+
+    Attributes
+    ----------
+    throughput : List[Dict[str, float]]
+        The number of resamples, the time in seconds and the resamples per second
+        of every worker in the last run
+    """
+
+    def __init__(
+        self,
+        ncpus: int = 1,
+        batch_size: Optional[int] = None,
+        memory_budget: int = 2**30,
+    ) -> None:
+        if ncpus < 1 or (batch_size is not None and batch_size < 1):
+            raise ValueError("The ncpus and batch_size must be positive integers")
+        if memory_budget < 1:
+            raise ValueError("The memory_budget must be a positive integer")
+        self.ncpus = ncpus
+        self.batch_size = batch_size
+        self.memory_budget = memory_budget
+        self.throughput: List[Dict[str, float]] = []
+
+    def _get_batch_size(self, n_rows: int, n_samples: int, n_workers: int = 1) -> int:
+        """The number of resamples of a batch that fit in the share of a worker"""
+        # NOTE: The correlations, their absolute values and the counts are always held
+        budget = self.memory_budget - 24 * n_rows * n_rows
+        if n_workers > 1:
+            # NOTE: Every worker also holds its own matrix of counts in shared memory
+            budget = budget // n_workers - 8 * n_rows * n_rows
+        batch_size = max(1, budget // _resample_nbytes(n_rows, n_samples))
+        if self.batch_size is not None:
+            batch_size = min(batch_size, self.batch_size)
+        return batch_size
+
+    def _count_extremes(
+        self,
+        data: np.ndarray,
+        method: str,
+        abs_corr: np.ndarray,
+        bootstraps: int,
+        entropy: int,
+    ) -> np.ndarray:
+        """
+        Count the resamples with absolute correlations at least `abs_corr` in parallel
+        Returns the matrix of counts
+        """
+        batch_size = self._get_batch_size(*data.shape, min(self.ncpus, bootstraps))
+        batches = [
+            (start, min(start + batch_size, bootstraps))
+            for start in range(0, bootstraps, batch_size)
+        ]
+        n_workers = min(self.ncpus, len(batches))
+        stats: List[Tuple[int, int, int, float]] = []
+        if n_workers <= 1:
+            counts = np.zeros((1, *abs_corr.shape), dtype=np.int64)
+            stats.append(
+                (
+                    0,
+                    os.getpid(),
+                    *_run_batches(data, abs_corr, counts[0], method, entropy, batches),
+                )
+            )
+        else:
+            arrays = {
+                "data": data,
+                "abs_corr": abs_corr,
+                "counts": np.broadcast_to(
+                    np.zeros((), dtype=np.int64), (n_workers, *abs_corr.shape)
+                ),
+            }
+            shms: Dict[str, shared_memory.SharedMemory] = {}
+            try:
+                blocks = {}
+                for name, array in arrays.items():
+                    shms[name] = shared_memory.SharedMemory(
+                        create=True, size=max(array.nbytes, 1)
+                    )
+                    shared = np.ndarray(
+                        array.shape, dtype=array.dtype, buffer=shms[name].buf
+                    )
+                    shared[...] = array
+                    del shared
+                    blocks[name] = (shms[name].name, array.shape, array.dtype.str)
+                tasks: mp.Queue = mp.Queue()
+                results: mp.Queue = mp.Queue()
+                for batch in batches + [None] * n_workers:
+                    tasks.put(batch)
+                workers = [
+                    mp.Process(
+                        target=_bootstrap_worker,
+                        args=(slot, blocks, method, entropy, tasks, results),
+                    )
+                    for slot in range(n_workers)
+                ]
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+                if any(worker.exitcode != 0 for worker in workers):
+                    raise RuntimeError("A bootstrap worker process failed")
+                stats = sorted(results.get() for _ in workers)
+                counts = np.ndarray(
+                    arrays["counts"].shape, dtype=np.int64, buffer=shms["counts"].buf
+                ).copy()
+            finally:
+                for shm in shms.values():
+                    shm.close()
+                    shm.unlink()
+        self.throughput = [
+            {
+                "worker": slot,
+                "pid": pid,
+                "resamples": n_resamples,
+                "seconds": seconds,
+                "resamples_per_second": n_resamples / seconds if seconds else 0.0,
+            }
+            for slot, pid, n_resamples, seconds in stats
+        ]
+        for worker_stats in self.throughput:
+            LOG.logger.info(
+                "Bootstrap worker {worker} (pid {pid}): {resamples} resamples in "
+                "{seconds:.2f}s ({resamples_per_second:.2f} resamples/s)".format(
+                    **worker_stats
+                )
+            )
+        return counts.sum(axis=0)
+
+    def bootstrap_pvalues(
+        self,
+        data: np.ndarray,
+        method: str = "pearson",
+        bootstraps: int = 1000,
+        seed: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the correlation matrix of the rows of a table and the bootstrap pvalues
+        The samples of every row are resampled independently with replacement, which
+        removes the correlations between the rows
+        The pvalue of a correlation is (count + 1) / (bootstraps + 1), where count is the
+        number of resamples with an absolute correlation at least as large
+
+        Parameters
+        ----------
+        data : np.ndarray
+            The table with the features as rows and the samples as columns
+        method : {'pearson', 'spearman'}
+            The correlation method
+            Default value is 'pearson'
+        bootstraps : int
+            The number of resamples
+            Default value is 1000
+        seed : int, optional
+            The seed of the random number generator
+            The results do not depend on the batches and `ncpus` for the same seed
+            Default value is None which uses a random seed
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            The correlation matrix and the matrix of pvalues
+        """
+        if method not in METHODS:
+            raise ValueError(
+                f"Method {method} not supported. Must be one of {list(METHODS)}"
+            )
+        data = np.array(data, dtype=float)
+        corr = METHODS[method](data)
+        abs_corr = np.abs(corr)
+        # NOTE: Every resample has its own random stream so that the batches are independent
+        entropy = np.random.SeedSequence(seed).entropy
+        counts = self._count_extremes(data, method, abs_corr, bootstraps, entropy)
+        pvalues = (counts + 1) / (bootstraps + 1)
+        return corr, pvalues
+
+
+def bootstrap_pvalues(
+    data: np.ndarray,
+    method: str = "pearson",
+    bootstraps: int = 1000,
+    seed: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    ncpus: int = 1,
+    memory_budget: int = 2**30,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the correlation matrix of the rows of a table and the bootstrap pvalues
+    See `BootstrapExecutor.bootstrap_pvalues` for the details
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The table with the features as rows and the samples as columns
+    method : {'pearson', 'spearman'}
+        The correlation method
+        Default value is 'pearson'
+    bootstraps : int
+        The number of resamples
+        Default value is 1000
+    seed : int, optional
+        The seed of the random number generator
+        Default value is None which uses a random seed
+    batch_size : int, optional
+        The largest number of resamples that are generated and correlated together
+        Default value is None which only limits the batches by `memory_budget`
+    ncpus : int
+        The number of worker processes
+        Default value is 1
+    memory_budget : int
+        The memory in bytes that the batches of resamples may use
+        Default value is 1073741824 (1 GiB)
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The correlation matrix and the matrix of pvalues
+    """
+    executor = BootstrapExecutor(
+        ncpus=ncpus, batch_size=batch_size, memory_budget=memory_budget
+    )
+    return executor.bootstrap_pvalues(data, method, bootstraps=bootstraps, seed=seed)
@@ -4,15 +4,31 @@
 
 
 from collections import namedtuple
-from typing import Dict, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 from warnings import warn
 
-from ete3 import NCBITaxa
-
 from ..logging import LOG
+from .taxonomy import TaxonomyBackend, get_taxid_cache, get_taxonomy
+
+FROM_STR_CACHE_SIZE = 2**16
 
 BaseLineage = namedtuple("Lineage", "Kingdom Phylum Class Order Family Genus Species")
 
+# Taxonomy ids resolved by the current backend: Lineage => (rank, taxid)
+_TAXIDS: Dict[Tuple[str, ...], Tuple[str, int]] = dict()
+_TAXIDS_BACKEND: Optional[TaxonomyBackend] = None
+
+
+def _resolved_taxids() -> Dict[Tuple[str, ...], Tuple[str, int]]:
+    """The taxonomy ids resolved so far, reset whenever the taxonomy backend changes"""
+    global _TAXIDS_BACKEND
+    backend = get_taxonomy()
+    if backend is not _TAXIDS_BACKEND:
+        _TAXIDS.clear()
+        _TAXIDS_BACKEND = backend
+    return _TAXIDS
+
 
 class Lineage(BaseLineage):
     """
@@ -27,6 +43,12 @@ class Lineage(BaseLineage):
     Family: str
     Genus: str
     Species: str
+
+    Notes
+    -----
+    Taxonomy ids are resolved using the process-wide backend from `micone.main.taxonomy`
+    The backend is only opened when `taxid` or `from_taxid` is first used
+    Use `micone.main.taxonomy.TaxonomyIndex` for offline lookups without sqlite queries
     """
 
     def __new__(
@@ -48,7 +70,6 @@ class Lineage(BaseLineage):
                 )
             )
         norm_taxa = [cls._normalize_tax(i) for i in tax_order]
-        cls._ncbi = NCBITaxa()
         return super().__new__(cls, *norm_taxa)
 
     @staticmethod
@@ -113,6 +134,7 @@ class Lineage(BaseLineage):
     def from_str(cls, lineage_str: str, style: str = "gg") -> "Lineage":
         """
         Create `Lineage` instance from a lineage string
+        Parsed lineages are interned, repeated calls return the same instance
 
         Parameters
         ----------
@@ -127,6 +149,11 @@ class Lineage(BaseLineage):
         Lineage
             Instance of the `Lineage` class
         """
+        return _interned_from_str(cls, lineage_str, style)
+
+    @classmethod
+    def _parse_str(cls, lineage_str: str, style: str) -> "Lineage":
+        """Parse a lineage string without interning, see `from_str`"""
         if style == "gg":
             if lineage_str.startswith("k"):
                 tax_list = lineage_str.split(";")
@@ -146,6 +173,23 @@ class Lineage(BaseLineage):
         taxa = [l.strip().rsplit("__", 1)[-1] for l in tax_list]
         return cls(*taxa)
 
+    @staticmethod
+    def from_str_cache_info() -> Tuple[int, int, int, int]:
+        """
+        Statistics of the interning cache used by `from_str`
+
+        Returns
+        -------
+        Tuple[int, int, int, int]
+            Named tuple containing (hits, misses, maxsize, currsize)
+        """
+        return _interned_from_str.cache_info()
+
+    @staticmethod
+    def from_str_cache_clear() -> None:
+        """Clear the interning cache used by `from_str` and reset its statistics"""
+        _interned_from_str.cache_clear()
+
     def to_str(self, style: str, level: str) -> str:
         """
         Return the string Lineage of the instance in requested 'style'
@@ -221,26 +265,45 @@ class Lineage(BaseLineage):
         tax = self[: ind + 1]
         return Lineage(*tax)
 
-    @property
-    def taxid(self) -> Tuple[str, int]:
+    def _taxid_query(self) -> List[str]:
         """
-        Get the NCBI taxonomy id of the Lineage
+        The list of names that are queried to obtain the taxonomy id of the lineage
+        The last two entries are the species and subspecies level names
 
         Returns
         -------
-        Tuple[str, int]
-            A tuple containing (taxonomy level, NCBI taxonomy id)
+        List[str]
+            The names ordered from the highest to the lowest level
         """
         query = list(self)
         # species or subspecies level
         query.append(query[-2] + " " + query[-1].strip())
         # species level
         query[-2] = query[-3] + " " + query[-2].split(" ")[0].strip()
-        taxid_dict = self._ncbi.get_name_translator(query)
+        return query
+
+    def _pick_taxid(
+        self, query: List[str], taxid_dict: Dict[str, List[int]]
+    ) -> Tuple[str, int]:
+        """
+        Pick the taxonomy id of the lowest level in `query` that is present in `taxid_dict`
+
+        Parameters
+        ----------
+        query : List[str]
+            The names returned by `_taxid_query`
+        taxid_dict : Dict[str, List[int]]
+            The mapping between lower case names and their taxonomy ids
+
+        Returns
+        -------
+        Tuple[str, int]
+            A tuple containing (taxonomy level, NCBI taxonomy id)
+        """
         taxid_list = [12908]
         for taxa in reversed(query):
-            if taxa != "" and taxa in taxid_dict:
-                taxid_list = taxid_dict[taxa]
+            if taxa != "" and taxa.lower() in taxid_dict:
+                taxid_list = taxid_dict[taxa.lower()]
                 break
         name = [q for q in reversed(query) if q != ""]
         if taxa != name[0] and taxa != name[1]:
@@ -257,6 +320,67 @@ class Lineage(BaseLineage):
         rank = self._fields[min(query.index(taxa), len(self._fields) - 1)]
         return rank, taxid
 
+    @property
+    def taxid(self) -> Tuple[str, int]:
+        """
+        Get the NCBI taxonomy id of the Lineage
+
+        Returns
+        -------
+        Tuple[str, int]
+            A tuple containing (taxonomy level, NCBI taxonomy id)
+        """
+        return self.resolve_taxids([self])[0]
+
+    @classmethod
+    def resolve_taxids(cls, lineages: Iterable["Lineage"]) -> List[Tuple[str, int]]:
+        """
+        Get the NCBI taxonomy ids of many lineages using a single database query
+        Lineages that were resolved before or are present in the persistent taxid
+        cache (see `micone.main.taxonomy.set_taxid_cache`) are not queried again
+
+        Parameters
+        ----------
+        lineages : Iterable[Lineage]
+            The lineages whose taxonomy ids are to be resolved
+
+        Returns
+        -------
+        List[Tuple[str, int]]
+            A list of tuples containing (taxonomy level, NCBI taxonomy id)
+            The order is the same as that of `lineages`
+        """
+        lineages = list(lineages)
+        resolved = _resolved_taxids()
+        missing = [
+            lineage for lineage in dict.fromkeys(lineages) if lineage not in resolved
+        ]
+        if not missing:
+            return [resolved[lineage] for lineage in lineages]
+        backend = get_taxonomy()
+        cache = get_taxid_cache()
+        version = backend.version if cache else None
+        if version is not None:
+            cached = cache.get_taxids([str(lineage) for lineage in missing], version)
+            for lineage in missing:
+                if str(lineage) in cached:
+                    resolved[lineage] = cached[str(lineage)]
+            missing = [lineage for lineage in missing if lineage not in resolved]
+        if missing:
+            queries = {lineage: lineage._taxid_query() for lineage in missing}
+            names = {name for query in queries.values() for name in query if name}
+            taxid_dict = {
+                name.lower(): taxids
+                for name, taxids in backend.get_name_translator(sorted(names)).items()
+            }
+            for lineage, query in queries.items():
+                resolved[lineage] = lineage._pick_taxid(query, taxid_dict)
+            if version is not None:
+                cache.put_taxids(
+                    {str(lineage): resolved[lineage] for lineage in missing}, version
+                )
+        return [resolved[lineage] for lineage in lineages]
+
     @classmethod
     def from_taxid(cls, taxid: int) -> "Lineage":
         """
@@ -272,19 +396,60 @@ class Lineage(BaseLineage):
         "Lineage"
             Instance of the `Lineage` class
         """
-        ncbi = NCBITaxa()
-        lineage_taxids = ncbi.get_lineage(taxid)
-        lineage_names = ncbi.get_taxid_translator(lineage_taxids)
-        lineage_ranks = {
-            v.capitalize(): k for k, v in ncbi.get_rank(lineage_taxids).items()
-        }
-        if "Superkingdom" in lineage_ranks:
-            lineage_ranks["Kingdom"] = lineage_ranks["Superkingdom"]
-            del lineage_ranks["Superkingdom"]
-        taxa: Dict[str, str] = {}
-        for field in cls._fields:
-            if field in lineage_ranks:
-                taxa[field] = lineage_names[lineage_ranks[field]]
-            else:
-                break
-        return cls(**taxa)
+        return cls.from_taxids([taxid])[0]
+
+    @classmethod
+    def from_taxids(cls, taxids: Iterable[int]) -> List["Lineage"]:
+        """
+        Create `Lineage` instances from many taxids
+        The names and ranks of all the lineages are obtained using a single query and
+        taxids present in the persistent taxid cache are not queried again
+
+        Parameters
+        ----------
+        taxids : Iterable[int]
+            Valid NCBI taxonomy ids
+
+        Returns
+        -------
+        List["Lineage"]
+            Instances of the `Lineage` class in the same order as `taxids`
+        """
+        taxids = [int(taxid) for taxid in taxids]
+        ncbi = get_taxonomy()
+        cache = get_taxid_cache()
+        version = ncbi.version if cache else None
+        lineages: Dict[int, Lineage] = dict()
+        if version is not None:
+            cached = cache.get_lineages(list(dict.fromkeys(taxids)), version)
+            lineages = {taxid: cls(*taxa) for taxid, taxa in cached.items()}
+        missing = [taxid for taxid in dict.fromkeys(taxids) if taxid not in lineages]
+        if not missing:
+            return [lineages[taxid] for taxid in taxids]
+        tracks = ncbi.get_lineage_translator(missing)
+        track_taxids = {t for track in tracks.values() for t in track}
+        names = ncbi.get_taxid_translator(track_taxids)
+        ranks = ncbi.get_rank(track_taxids)
+        for taxid in missing:
+            lineage_ranks = {
+                ranks[t].capitalize(): t for t in tracks[taxid] if t in ranks
+            }
+            if "Superkingdom" in lineage_ranks:
+                lineage_ranks["Kingdom"] = lineage_ranks["Superkingdom"]
+                del lineage_ranks["Superkingdom"]
+            taxa: Dict[str, str] = {}
+            for field in cls._fields:
+                if field in lineage_ranks:
+                    taxa[field] = names[lineage_ranks[field]]
+                else:
+                    break
+            lineages[taxid] = cls(**taxa)
+        if version is not None:
+            cache.put_lineages({t: list(lineages[t]) for t in missing}, version)
+        return [lineages[taxid] for taxid in taxids]
+
+
+@lru_cache(maxsize=FROM_STR_CACHE_SIZE)
+def _interned_from_str(cls: type, lineage_str: str, style: str) -> Lineage:
+    """Bounded LRU cache of parsed lineages keyed by (cls, lineage_str, style)"""
+    return cls._parse_str(lineage_str, style)
@@ -0,0 +1,232 @@
+"""
+    Module that implements vectorized methods to work with tables of lineages
+    Each function is the columnar equivalent of a `Lineage` method and returns identical values
+
+    Taxonomy tables contain few distinct names compared to the number of rows,
+    therefore the string operations are only performed on the unique values of every column
+"""
+
+from typing import Callable, List, Tuple
+from warnings import warn
+
+import numpy as np
+import pandas as pd
+
+from .lineage import Lineage
+
+FIELDS: List[str] = list(Lineage._fields)
+
+_UNWANTED_CHARS = str.maketrans("", "", "[]'=")
+
+
+def _strip(tax_strs: pd.Series) -> pd.Series:
+    """Strip whitespace from taxonomy names, see `Lineage._normalize_tax`"""
+    return tax_strs.str.strip()
+
+
+def _strip_prefix(tax_strs: pd.Series) -> pd.Series:
+    """Remove the rank prefixes from taxonomy names, see `Lineage.from_str`"""
+    return tax_strs.str.replace(r"(?s)^.*__", "", regex=True).str.strip()
+
+
+def _normalize_columns(
+    raw: pd.DataFrame, func: Callable[[pd.Series], pd.Series]
+) -> pd.DataFrame:
+    """
+    Normalize the `Lineage` fields of a table by applying `func` followed by the
+    removal of unwanted characters to the unique values of every column
+    Missing columns and values are treated as empty taxonomy names
+    """
+    n_rows = len(raw)
+    empty = np.ones((n_rows, len(FIELDS)), dtype=bool)
+    stripped = dict()
+    normalized = dict()
+    for i, field in enumerate(FIELDS):
+        if field not in raw:
+            stripped[field] = normalized[field] = np.full(n_rows, "", dtype=object)
+            continue
+        codes, uniques = pd.factorize(raw[field])
+        # NOTE: Missing values have code -1 and are mapped to the appended empty name
+        unique_strs = func(pd.Series(uniques, dtype=object)).values
+        unique_strs = np.append(unique_strs, "").astype(object)
+        empty[:, i] = (unique_strs == "")[codes]
+        stripped[field] = unique_strs[codes]
+        translated = [tax.translate(_UNWANTED_CHARS) for tax in unique_strs]
+        normalized[field] = np.array(translated, dtype=object)[codes]
+    gaps = ((np.cumsum(empty, axis=1) > 0) & ~empty).any(axis=1)
+    if gaps.any():
+        row = np.flatnonzero(gaps)[0]
+        warn(
+            RuntimeWarning(
+                "Lower levels should not be filled if higher levels are empty: "
+                f"{[stripped[field][row] for field in FIELDS]} and {gaps.sum() - 1} more"
+            )
+        )
+    return pd.DataFrame(normalized, index=raw.index)
+
+
+def _row_codes(taxa: pd.DataFrame, fields: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Label the unique rows of the `fields` columns of a table
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The label of every row and the position of the first row of every label
+    """
+    codes = np.zeros(len(taxa), dtype=np.int64)
+    for field in fields:
+        field_codes, uniques = pd.factorize(taxa[field])
+        codes, _ = pd.factorize(codes * (len(uniques) + 1) + field_codes + 1)
+    _, first = np.unique(codes, return_index=True)
+    return codes, first
+
+
+def normalize(taxa: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize a table of lineages, equivalent to `Lineage(**row)` for every row
+
+    Parameters
+    ----------
+    taxa : pd.DataFrame
+        The table containing a subset of the `Lineage` fields as columns
+        Other columns are ignored and missing fields or values are assumed to be empty
+
+    Returns
+    -------
+    pd.DataFrame
+        The table of normalized taxonomy names with all the `Lineage` fields as columns
+    """
+    return _normalize_columns(taxa, _strip)
+
+
+def from_strs(lineage_strs: pd.Series, style: str = "gg") -> pd.DataFrame:
+    """
+    Create a table of lineages from lineage strings, equivalent to `Lineage.from_str`
+
+    Parameters
+    ----------
+    lineage_strs : pd.Series
+        The lineages in the form of strings
+    style : {'gg', 'silva'}, optional
+        The style of the lineage strings
+        Default is 'gg'
+
+    Returns
+    -------
+    pd.DataFrame
+        The table of lineages with the same index as `lineage_strs`
+    """
+    if style == "gg":
+        full_prefix, partial_prefix = "k", "p"
+    elif style == "silva":
+        full_prefix, partial_prefix = "D_0", "D_1"
+    else:
+        raise ValueError("Style has to be either 'gg' or 'silva'")
+    codes, uniques = pd.factorize(lineage_strs)
+    if (codes < 0).any():
+        raise ValueError("Incompatible lineage string")
+    unique_strs = pd.Series(uniques, dtype=object)
+    if style == "silva":
+        unique_strs = unique_strs.str.partition(";D_7")[0]
+    full = unique_strs.str.startswith(full_prefix).astype(bool)
+    if not full.all():
+        partial = unique_strs.str.startswith(partial_prefix).astype(bool)
+        if not (full | partial).all():
+            raise ValueError("Incompatible lineage string")
+        unique_strs = unique_strs.where(full, "Bacteria;" + unique_strs)
+    tax_lists = [lineage_str.split(";") for lineage_str in unique_strs]
+    n_levels = max(map(len, tax_lists))
+    if n_levels > len(FIELDS):
+        raise ValueError(f"Lineage strings cannot have more than {len(FIELDS)} levels")
+    raw = pd.DataFrame(tax_lists, columns=FIELDS[:n_levels])
+    unique_taxa = _normalize_columns(raw, _strip_prefix)
+    taxa = unique_taxa.take(codes)
+    taxa.index = lineage_strs.index
+    return taxa
+
+
+def names(taxa: pd.DataFrame) -> pd.DataFrame:
+    """
+    Get the lowest populated level and name of every lineage, equivalent to `Lineage.name`
+
+    Parameters
+    ----------
+    taxa : pd.DataFrame
+        The normalized table of lineages
+
+    Returns
+    -------
+    pd.DataFrame
+        The table containing 'level' and 'name' columns
+    """
+    values = taxa[FIELDS].values
+    populated = values != ""
+    lowest = len(FIELDS) - 1 - np.argmax(populated[:, ::-1], axis=1)
+    classified = populated.any(axis=1)
+    level = np.where(classified, np.array(FIELDS, dtype=object)[lowest], "Kingdom")
+    name = np.where(classified, values[np.arange(len(taxa)), lowest], "unclassified")
+    return pd.DataFrame({"level": level, "name": name}, index=taxa.index)
+
+
+def get_superset(taxa: pd.DataFrame, level: str) -> pd.DataFrame:
+    """
+    Get the superset of every lineage for the requested level,
+    equivalent to `Lineage.get_superset`
+
+    Parameters
+    ----------
+    taxa : pd.DataFrame
+        The normalized table of lineages
+    level : str
+        The lowest Lineage field to be used to calculate the superset
+
+    Returns
+    -------
+    pd.DataFrame
+        The table of lineages that are supersets of the input lineages
+    """
+    if level not in FIELDS:
+        raise ValueError(f"{level} not a valid field for Lineage")
+    ind = FIELDS.index(level)
+    superset = taxa[FIELDS].copy()
+    superset[FIELDS[ind + 1 :]] = ""
+    return superset
+
+
+def to_strs(taxa: pd.DataFrame, style: str = "gg", level: str = "Species") -> pd.Series:
+    """
+    Get the lineage strings of every lineage, equivalent to `Lineage.to_str`
+
+    Parameters
+    ----------
+    taxa : pd.DataFrame
+        The normalized table of lineages
+    style : {'gg', 'silva'}, optional
+        The style of the lineage string
+        Default is 'gg'
+    level : str, optional
+        The lowest Lineage field that is to be populated
+        Default is 'Species'
+
+    Returns
+    -------
+    pd.Series
+        The lineage strings with the same index as `taxa`
+    """
+    if level not in FIELDS:
+        raise ValueError(f"{level} not a valid field for Lineage")
+    fields = FIELDS[: FIELDS.index(level) + 1]
+    if style == "gg":
+        prefixes = [f.lower()[0] for f in fields]
+    elif style == "silva":
+        prefixes = [f"D_{i}" for i in range(len(fields))]
+    else:
+        raise ValueError("Style needs to be either 'gg' or 'silva'")
+    codes, first = _row_codes(taxa, fields)
+    unique_taxa = taxa[fields].iloc[first]
+    unique_strs = [
+        ";".join(f"{prefix}__{tax}" for prefix, tax in zip(prefixes, row))
+        for row in unique_taxa.itertuples(index=False)
+    ]
+    return pd.Series(np.array(unique_strs, dtype=object)[codes], index=taxa.index)
@@ -2,13 +2,15 @@
     Module that defines the `Network` object and methods to read, write and manipulate it
 """
 
-from typing import Any, Dict, List, Optional, Tuple, Union
+from itertools import chain
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 from warnings import warn
 
 import networkx as nx
 import numpy as np
 import pandas as pd
 import simplejson
+from scipy import sparse
 from statsmodels.stats.multitest import multipletests
 
 from ..validation import (
@@ -28,6 +30,10 @@ from . import Lineage
 DType = List[Dict[str, Any]]
 LinkDType = Tuple[str, str, Dict[str, float]]
 
+NODE_FIELDS = ["id", "lineage", "name", "taxid", "taxlevel", "abundance", "children"]
+
+BINARY_SUFFIX = ".npz"
+
 
 class Network:
     """
@@ -40,6 +46,8 @@ class Network:
     links : List[LinkDType]
         The list of links in the network
         Each link is a dict and must contain: 'source', 'target', 'weight', 'pvalue' as keys
+        The source and target must be nodes, the weight must be finite and the pvalue
+        must be in [0, 1] or NaN
     metadata : dict
         The metadata for the whole network (general and experiment)
         Must contain 'host', 'condition', 'location', 'experimental_metadata', 'pubmed_id',
@@ -76,6 +84,11 @@ class Network:
     graph : Union[nx.Graph, nx.DiGraph]
         The networkx graph representation of the network
 
+    Notes
+    -----
+    The nodes are stored as a table indexed by the node ids and the links as arrays of
+    node positions, weights and pvalues. The networkx graph is only created on first access
+
     Examples
     --------
     >>> network = Network.load_data()
@@ -95,6 +108,44 @@ class Network:
         pvalue_correction: Optional[str] = "fdr_bh",
         directed: bool = False,
     ) -> None:
+        self._initialize(
+            nodes,
+            [link[0] for link in links],
+            [link[1] for link in links],
+            np.array([link[2]["weight"] for link in links], dtype=float),
+            np.array([link[2]["pvalue"] for link in links], dtype=float),
+            metadata,
+            cmetadata,
+            obs_metadata,
+            children_map,
+            interaction_type,
+            interaction_threshold,
+            pvalue_threshold,
+            pvalue_correction,
+            directed,
+        )
+
+    def _initialize(
+        self,
+        nodes: List[str],
+        sources: Union[List[str], np.ndarray],
+        targets: Union[List[str], np.ndarray],
+        weights: np.ndarray,
+        pvalues: np.ndarray,
+        metadata: dict,
+        cmetadata: dict,
+        obs_metadata: pd.DataFrame,
+        children_map: Optional[dict],
+        interaction_type: str,
+        interaction_threshold: float,
+        pvalue_threshold: float,
+        pvalue_correction: Optional[str],
+        directed: bool,
+    ) -> None:
+        """
+        Validate and store the network data
+        The parameters are described in `Network` and `Network.from_arrays`
+        """
         self.interaction_threshold = interaction_threshold
         self.pvalue_threshold = pvalue_threshold
         obsmeta_validator = ObsmetaType()
@@ -104,45 +155,99 @@ class Network:
         if children_map:
             children_validator = ChildrenmapType()
             children_validator.validate(children_map)
-        pvalues = np.array([link[2]["pvalue"] for link in links])
+        weights = np.asarray(weights, dtype=float)
+        pvalues = np.asarray(pvalues, dtype=float)
+        self._validate_links(sources, targets, weights, pvalues)
         if pvalue_correction:
-            corrected_pvalues = self._correct_pvalues(
+            pvalues = self._correct_pvalues(
                 pvalues, pvalue_correction, pvalue_threshold
             )
-        else:
-            corrected_pvalues = pvalues
-        corrected_links: List[LinkDType] = []
-        for i, link in enumerate(links):
-            source, target = link[0], link[1]
-            corrected_links.append(
-                (source, target, {**link[2], "pvalue": corrected_pvalues[i]})
-            )
         if "pvalue_threshold" not in cmetadata:
             cmetadata["pvalue_threshold"] = pvalue_threshold
         if "pvalue_correction" not in cmetadata:
             cmetadata["pvalue_correction"] = pvalue_correction
         if "interaction_threshold" not in cmetadata:
             cmetadata["interaction_threshold"] = interaction_threshold
-        self.graph = self._create_graph(
+        self._node_table = self._create_node_table(nodes, obs_metadata, children_map)
+        self._metadata = self._create_metadata(
+            metadata, cmetadata, interaction_type, directed
+        )
+        (
+            self._sources,
+            self._targets,
+            self._weights,
+            self._pvalues,
+        ) = self._create_edges(
+            self.node_ids, sources, targets, weights, pvalues, directed
+        )
+        self._graph: Optional[Union[nx.Graph, nx.DiGraph]] = None
+        nodes_model = NodesModel({"nodes": self.nodes}, strict=False)
+        nodes_model.validate()
+        networkmetadata_model = NetworkmetadataModel(self.metadata, strict=False)
+        networkmetadata_model.validate()
+
+    @classmethod
+    def from_arrays(
+        cls,
+        nodes: List[str],
+        sources: Union[List[str], np.ndarray],
+        targets: Union[List[str], np.ndarray],
+        weights: np.ndarray,
+        pvalues: np.ndarray,
+        metadata: dict,
+        cmetadata: dict,
+        obs_metadata: pd.DataFrame,
+        children_map: Optional[dict] = None,
+        interaction_type: str = "correlation",
+        interaction_threshold: float = 0.3,
+        pvalue_threshold: float = 0.05,
+        pvalue_correction: Optional[str] = "fdr_bh",
+        directed: bool = False,
+    ) -> "Network":
+        """
+        Create a `Network` object from arrays of link endpoints and properties
+        The other parameters are the same as for `Network`
+
+        Parameters
+        ----------
+        nodes : List[str]
+            The list of nodes in the network
+        sources : Union[List[str], np.ndarray]
+            The source node of every link
+        targets : Union[List[str], np.ndarray]
+            The target node of every link
+        weights : np.ndarray
+            The weight of every link
+        pvalues : np.ndarray
+            The pvalue of every link
+
+        Returns
+        -------
+        Network
+            The instance of the `Network` class
+        """
+        network = cls.__new__(cls)
+        network._initialize(
             nodes,
-            corrected_links,
+            sources,
+            targets,
+            weights,
+            pvalues,
             metadata,
             cmetadata,
             obs_metadata,
             children_map,
             interaction_type,
+            interaction_threshold,
+            pvalue_threshold,
+            pvalue_correction,
             directed,
         )
-        nodes_model = NodesModel({"nodes": self.nodes}, strict=False)
-        nodes_model.validate()
-        links_model = LinksModel({"links": self.links}, strict=False)
-        links_model.validate()
-        networkmetadata_model = NetworkmetadataModel(self.metadata, strict=False)
-        networkmetadata_model.validate()
+        return network
 
     def __repr__(self) -> str:
-        n_nodes = len(self.nodes)
-        n_links = len(self.links)
+        n_nodes = len(self.node_ids)
+        n_links = len(self.sources)
         directionality = self.metadata["directionality"]
         interaction_type = self.metadata["interaction_type"]
         string = (
@@ -220,57 +325,30 @@ class Network:
         return pvals_correct
 
     @staticmethod
-    def _create_graph(
-        nodes: List[str],
-        links: List[LinkDType],
-        emetadata: dict,
-        cmetadata: dict,
-        obs_metadata: pd.DataFrame,
-        children_map: Optional[dict],
-        interaction_type: str,
-        directed: bool,
-    ) -> Union[nx.Graph, nx.DiGraph]:
+    def _create_node_table(
+        nodes: List[str], obs_metadata: pd.DataFrame, children_map: Optional[dict]
+    ) -> pd.DataFrame:
         """
-        Create network from interaction matrix, pvalue matrix, metadata dictionary,
-        lineage table and children mapping
+        Create the table of node properties from the lineage table and children mapping
 
         Parameters
         ----------
         nodes : List[str]
             The list of nodes in the network
-        links : List[LinkDType]
-            The list of links in the network
-        emetadata : dict
-            The dictionary of general and experimental metadata
-        cmetadata : dict
-            The dictionary of computational metadata
         obs_metadata : pd.DataFrame
             The `DataFrame` containing taxonomy information for the nodes of the network
         children_map : dict
             The dictionary that contains the mapping {obs_id => [children]}
-        interaction_type : str
-            The type of interaction encoded by the edges of the network
-        directed : bool
-            Flag to determine whether the network is directed or not
 
         Returns
         -------
-        Union[nx.Graph, nx.DiGraph]
-            The networkx graph of the network
+        pd.DataFrame
+            The table with one row per unique node and the node properties as columns
         """
-        directionality = "directed" if directed else "undirected"
-        metadata = {
-            **emetadata,
-            "computational_metadata": cmetadata,
-            "interaction_type": interaction_type,
-            "directionality": directionality,
-        }
-        if directed:
-            graph = nx.DiGraph(**metadata)
-        else:
-            graph = nx.Graph(**metadata)
+        node_ids = pd.Index(list(dict.fromkeys(nodes)), dtype=object)
         abundance_flag = "Abundance" in obs_metadata.columns
-        for node in nodes:
+        node_data: List[Tuple[str, Lineage, Optional[float], List[str]]] = []
+        for node in node_ids:
             if abundance_flag:
                 lineage = Lineage(
                     **obs_metadata.drop("Abundance", axis=1).loc[node].to_dict()
@@ -292,55 +370,324 @@ class Network:
             else:
                 children = []
             sup_lineage = lineage.get_superset(lineage.name[0])
-            graph.add_node(
-                node,
-                id=node,
-                lineage=sup_lineage.to_str(style="gg", level=sup_lineage.name[0]),
-                name=sup_lineage.name[1],
-                taxid=sup_lineage.taxid[1],
-                taxlevel=sup_lineage.name[0],
-                abundance=abundance,
-                children=children,
+            node_data.append((node, sup_lineage, abundance, children))
+        # NOTE: Taxonomy ids of all the nodes are resolved in one query
+        taxids = Lineage.resolve_taxids(data[1] for data in node_data)
+        records: DType = []
+        for (node, sup_lineage, abundance, children), (_, taxid) in zip(
+            node_data, taxids
+        ):
+            taxlevel, name = sup_lineage.name
+            records.append(
+                dict(
+                    id=node,
+                    lineage=sup_lineage.to_str(style="gg", level=taxlevel),
+                    name=name,
+                    taxid=taxid,
+                    taxlevel=taxlevel,
+                    abundance=abundance,
+                    children=children,
+                )
+            )
+        return pd.DataFrame.from_records(records, index=node_ids, columns=NODE_FIELDS)
+
+    @staticmethod
+    def _create_metadata(
+        emetadata: dict, cmetadata: dict, interaction_type: str, directed: bool
+    ) -> Dict[str, Any]:
+        """
+        Create the network metadata from the general, experimental and computational metadata
+
+        Parameters
+        ----------
+        emetadata : dict
+            The dictionary of general and experimental metadata
+        cmetadata : dict
+            The dictionary of computational metadata
+        interaction_type : str
+            The type of interaction encoded by the edges of the network
+        directed : bool
+            Flag to determine whether the network is directed or not
+
+        Returns
+        -------
+        Dict[str, Any]
+            The metadata for the network
+        """
+        directionality = "directed" if directed else "undirected"
+        metadata = {
+            **emetadata,
+            "computational_metadata": cmetadata,
+            "interaction_type": interaction_type,
+            "directionality": directionality,
+        }
+        return metadata
+
+    @staticmethod
+    def _validate_links(
+        sources: Union[List[str], np.ndarray],
+        targets: Union[List[str], np.ndarray],
+        weights: np.ndarray,
+        pvalues: np.ndarray,
+    ) -> None:
+        """
+        Validate the link properties, the link endpoints are validated in `_create_edges`
+        The weights must be finite and the pvalues must be in [0, 1] or NaN
+        """
+        n_links = len(sources)
+        if not (len(targets) == len(weights) == len(pvalues) == n_links):
+            raise ValueError("The link arrays must have the same length")
+        if not np.isfinite(weights).all():
+            ind = np.flatnonzero(~np.isfinite(weights))[0]
+            raise ValueError(
+                f"Link between {sources[ind]} and {targets[ind]} has a weight "
+                f"{weights[ind]} that is not finite"
             )
-        for link in links:
-            source, target = link[0], link[1]
-            # NOTE: Self-loops are not allowed
-            if source == target:
-                continue
-            weight, pvalue = link[2]["weight"], link[2]["pvalue"]
-            graph.add_edge(
-                source,
-                target,
-                source=source,
-                target=target,
-                weight=weight,
-                pvalue=pvalue,
+        invalid = (pvalues < 0) | (pvalues > 1)
+        if invalid.any():
+            ind = np.flatnonzero(invalid)[0]
+            raise ValueError(
+                f"Link between {sources[ind]} and {targets[ind]} has a pvalue "
+                f"{pvalues[ind]} that is not in [0, 1]"
             )
-        return graph
+
+    @staticmethod
+    def _create_edges(
+        node_ids: pd.Index,
+        sources: List[str],
+        targets: List[str],
+        weights: np.ndarray,
+        pvalues: np.ndarray,
+        directed: bool,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Create the edge arrays of the network from the link endpoints and properties
+
+        Parameters
+        ----------
+        node_ids : pd.Index
+            The unique ids of the nodes in the network
+        sources : List[str]
+            The source node of every link
+        targets : List[str]
+            The target node of every link
+        weights : np.ndarray
+            The weight of every link
+        pvalues : np.ndarray
+            The pvalue of every link
+        directed : bool
+            Flag to determine whether the network is directed or not
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+            The source positions, target positions, weights and pvalues of the edges
+        """
+        source_inds = node_ids.get_indexer(sources)
+        target_inds = node_ids.get_indexer(targets)
+        missing = (source_inds < 0) | (target_inds < 0)
+        if missing.any():
+            ind = np.flatnonzero(missing)[0]
+            raise ValueError(
+                f"Link between {sources[ind]} and {targets[ind]} has nodes "
+                "that are not present in the network"
+            )
+        # NOTE: Self-loops are not allowed
+        rows = np.flatnonzero(source_inds != target_inds)
+        if directed:
+            first_inds, second_inds = source_inds[rows], target_inds[rows]
+        else:
+            first_inds = np.minimum(source_inds[rows], target_inds[rows])
+            second_inds = np.maximum(source_inds[rows], target_inds[rows])
+        # NOTE: Repeated links keep the position of the first and the data of the last occurrence
+        # The edges are ordered by their first node, same as the `networkx` edge iteration
+        n_nodes = max(len(node_ids), 1)
+        keys = first_inds.astype(np.int64) * n_nodes + second_inds
+        if not (np.diff(keys) > 0).all():
+            _, first = np.unique(keys, return_index=True)
+            unique_keys, last = np.unique(keys[::-1], return_index=True)
+            order = np.lexsort((first, unique_keys // n_nodes))
+            rows = rows[len(keys) - 1 - last[order]]
+        return (
+            source_inds[rows].astype(np.int32),
+            target_inds[rows].astype(np.int32),
+            weights[rows],
+            pvalues[rows],
+        )
+
+    @classmethod
+    def _from_node_table(
+        cls,
+        node_table: pd.DataFrame,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray,
+        pvalues: np.ndarray,
+        metadata: Dict[str, Any],
+        interaction_threshold: float,
+        pvalue_threshold: float,
+    ) -> "Network":
+        """
+        Create a `Network` object directly from its node table and edge arrays
+        The data is neither validated nor copied
+
+        Parameters
+        ----------
+        node_table : pd.DataFrame
+            The table with one row per node and the node properties as columns
+        sources : np.ndarray
+            The positions of the source nodes of the links in the node table
+        targets : np.ndarray
+            The positions of the target nodes of the links in the node table
+        weights : np.ndarray
+            The weights of the links
+        pvalues : np.ndarray
+            The pvalues of the links
+        metadata : Dict[str, Any]
+            The metadata for the network
+        interaction_threshold : float
+            The value to which the interactions (absolute value) are to be thresholded
+        pvalue_threshold : float
+            This is the `alpha` value for pvalue cutoff
+
+        Returns
+        -------
+        Network
+            The instance of the `Network` class
+        """
+        network = cls.__new__(cls)
+        network.interaction_threshold = interaction_threshold
+        network.pvalue_threshold = pvalue_threshold
+        network._node_table = node_table
+        network._metadata = metadata
+        network._sources = sources
+        network._targets = targets
+        network._weights = weights
+        network._pvalues = pvalues
+        network._graph = None
+        return network
+
+    @property
+    def node_ids(self) -> pd.Index:
+        """The ids of the nodes in the network"""
+        return self._node_table.index
+
+    @property
+    def node_table(self) -> pd.DataFrame:
+        """The table of node properties indexed by the node ids"""
+        return self._node_table
+
+    @property
+    def sources(self) -> np.ndarray:
+        """The positions of the source nodes of the links in `node_ids`"""
+        return self._sources
+
+    @property
+    def targets(self) -> np.ndarray:
+        """The positions of the target nodes of the links in `node_ids`"""
+        return self._targets
+
+    @property
+    def weights(self) -> np.ndarray:
+        """The weights of the links in the network"""
+        return self._weights
+
+    @property
+    def pvalues(self) -> np.ndarray:
+        """The pvalues of the links in the network"""
+        return self._pvalues
+
+    @property
+    def graph(self) -> Union[nx.Graph, nx.DiGraph]:
+        """The networkx graph representation of the network, created on first access"""
+        if self._graph is None:
+            if self.metadata["directionality"] == "directed":
+                graph = nx.DiGraph()
+            else:
+                graph = nx.Graph()
+            graph.graph = self.metadata
+            graph.add_nodes_from((node["id"], node) for node in self.nodes)
+            graph.add_edges_from(
+                (link["source"], link["target"], link) for link in self.links
+            )
+            self._graph = graph
+        return self._graph
 
     @property
     def nodes(self) -> DType:
         """The list of nodes in the network and their corresponding properties"""
-        return [data for _, data in self.graph.nodes(data=True)]
+        return self._node_table.to_dict("records")
 
     @property
     def links(self) -> DType:
         """The list of links in the network and their corresponding properties"""
-        return [data for _, _, data in self.graph.edges(data=True)]
+        return self._get_links()
+
+    def _get_links(self, mask: Optional[np.ndarray] = None) -> DType:
+        """
+        The list of links selected by `mask` and their corresponding properties
+
+        Parameters
+        ----------
+        mask : np.ndarray, optional
+            The boolean array that selects the links
+            Default value is None which selects all the links
+
+        Returns
+        -------
+        DType
+            The list of selected links in the network
+        """
+        sources, targets = self._sources, self._targets
+        weights, pvalues = self._weights, self._pvalues
+        if mask is not None:
+            sources, targets = sources[mask], targets[mask]
+            weights, pvalues = weights[mask], pvalues[mask]
+        ids = self.node_ids.values
+        return [
+            {"source": source, "target": target, "weight": weight, "pvalue": pvalue}
+            for source, target, weight, pvalue in zip(
+                ids[sources], ids[targets], weights.tolist(), pvalues.tolist()
+            )
+        ]
 
     @property
     def metadata(self) -> Dict[str, Any]:
         """The metadata for the network"""
-        return self.graph.graph
+        return self._metadata
+
+    def get_adjacency_matrix(self, key: str) -> Tuple[sparse.csr_matrix, pd.Index]:
+        """
+        Returns the sparse adjacency matrix representation for the requested `key`
+        The rows of the matrix are the targets and the columns are the sources of the links
+
+        Parameters
+        ----------
+        key : {'weight', 'pvalue'}
+            The `edge` property to be used to construct the matrix
+
+        Returns
+        -------
+        Tuple[sparse.csr_matrix, pd.Index]
+            The adjacency matrix and the node ids of its rows and columns
+        """
+        values = {"weight": self._weights, "pvalue": self._pvalues}[key]
+        rows, cols = self._targets, self._sources
+        if self.metadata["directionality"] != "directed":
+            rows, cols = np.r_[rows, cols], np.r_[cols, rows]
+            values = np.r_[values, values]
+        size = len(self.node_ids)
+        adj_matrix = sparse.csr_matrix((values, (rows, cols)), shape=(size, size))
+        return adj_matrix, self.node_ids
 
     def get_adjacency_table(self, key: str) -> pd.DataFrame:
         """
         Returns the adjacency table representation for the requested `key`
-        This method does not support `Graph`
+        This is the dense version of `get_adjacency_matrix`
 
         Parameters
         ----------
-        key : str
+        key : {'weight', 'pvalue'}
             The `edge` property to be used to construct the table
 
         Returns
@@ -348,18 +695,40 @@ class Network:
         pd.DataFrame:
             The adjacency table
         """
-        ids = list(self.graph.nodes)
-        size = len(ids)
-        adj_table = pd.DataFrame(
-            data=np.zeros((size, size), dtype=float), index=ids, columns=ids
-        )
-        graph = self.graph
-        for source_id, target_id, data in graph.edges(data=True):
-            adj_table[source_id][target_id] = data[key]
-            if not self.graph.is_directed():
-                adj_table[target_id][source_id] = data[key]
+        adj_matrix, node_ids = self.get_adjacency_matrix(key)
+        ids = list(node_ids)
+        adj_table = pd.DataFrame(data=adj_matrix.toarray(), index=ids, columns=ids)
         return adj_table
 
+    def edge_mask(
+        self, pvalue_filter: bool = False, interaction_filter: bool = False
+    ) -> np.ndarray:
+        """
+        Returns the mask of the links of the network that pass the thresholds
+
+        Parameters
+        ----------
+        pvalue_filter : bool
+            If True will use `pvalue_threshold` for filtering
+            Default  value is False
+        interaction_filter : bool
+            If True will use `interaction_threshold` for filtering
+            Default  value is False
+
+        Returns
+        -------
+        np.ndarray
+            The boolean array that is True for the links that pass the thresholds
+            The array is aligned with `links`, `sources`, `targets`, `weights` and `pvalues`
+        """
+        mask = np.ones(len(self._weights), dtype=bool)
+        if interaction_filter:
+            mask &= np.abs(self._weights) >= abs(self.interaction_threshold)
+        # NOTE: Networks without pvalues are not filtered on pvalues
+        if pvalue_filter and not np.isnan(self._pvalues).all():
+            mask &= self._pvalues <= self.pvalue_threshold
+        return mask
+
     def _filter_links(self, pvalue_filter: bool, interaction_filter: bool) -> DType:
         """
         The links of the network after applying filtering
@@ -376,27 +745,16 @@ class Network:
         DType
             The list of links in the network after applying thresholds
         """
-        interaction_threshold = abs(self.interaction_threshold)
-        interaction_func = lambda x: abs(x["weight"]) >= interaction_threshold
-        pvalues = [l["pvalue"] for l in self.links]
-        no_pvalues = np.isnan(pvalues).all()
-        if no_pvalues:
-            pvalue_func = lambda _: True
-        else:
-            pvalue_func = lambda x: x["pvalue"] <= self.pvalue_threshold
-        if pvalue_filter and interaction_filter:
-            filter_func = lambda x: interaction_func(x) and pvalue_func(x)
-        elif interaction_filter:
-            filter_func = interaction_func
-        elif pvalue_filter:
-            filter_func = pvalue_func
-        else:
+        if not pvalue_filter and not interaction_filter:
             return self.links
-        links_thres = list(filter(filter_func, self.links))
-        return links_thres
+        mask = self.edge_mask(
+            pvalue_filter=pvalue_filter, interaction_filter=interaction_filter
+        )
+        return self._get_links(mask)
 
     def filter(self, pvalue_filter: bool, interaction_filter: bool) -> "Network":
         """Filter network using pvalue and interaction thresholds
+        The filtered network shares the nodes of this network and is not revalidated
 
         Parameters
         ----------
@@ -410,17 +768,89 @@ class Network:
         "Network"
             The filtered `Network` object
         """
-        nodes = {"nodes": self.nodes}
-        links = {
-            "links": self._filter_links(
-                pvalue_filter=pvalue_filter, interaction_filter=interaction_filter
-            )
-        }
-        metadata = self.metadata
-        network_data = {**metadata, **nodes, **links}
-        new_network = Network.load_json(raw_data=network_data)
+        mask = self.edge_mask(
+            pvalue_filter=pvalue_filter, interaction_filter=interaction_filter
+        )
+        return self._select_links(mask)
+
+    def _select_links(
+        self, mask: np.ndarray, pvalues: Optional[np.ndarray] = None
+    ) -> "Network":
+        """
+        Create a network with the nodes of this network and the links selected by `mask`
+
+        Parameters
+        ----------
+        mask : np.ndarray
+            The boolean array that selects the links
+        pvalues : np.ndarray, optional
+            The new pvalues of the selected links
+            Default value is None which keeps the current pvalues
+
+        Returns
+        -------
+        "Network"
+            The new `Network` object
+        """
+        if pvalues is None:
+            pvalues = self._pvalues[mask]
+        # NOTE: The node table is shared since it is never modified after creation
+        new_network = self._from_node_table(
+            self._node_table,
+            self._sources[mask],
+            self._targets[mask],
+            self._weights[mask],
+            np.asarray(pvalues, dtype=float),
+            dict(self.metadata),
+            self.interaction_threshold,
+            self.pvalue_threshold,
+        )
         return new_network
 
+    @staticmethod
+    def _extract_links(
+        interactions: pd.DataFrame,
+        pvalues: Optional[pd.DataFrame],
+        directed: bool,
+        interaction_threshold: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Extract the links from the nonzero entries of the interaction matrix
+        Only the upper triangle of the matrix is used for undirected networks
+
+        Parameters
+        ----------
+        interactions : pd.DataFrame
+            The `DataFrame` containing the interaction matrix
+        pvalues : pd.DataFrame, optional
+            The `DataFrame` containing the pvalue matrix
+        directed : bool
+            Flag to determine whether the network is directed or not
+        interaction_threshold : float, optional
+            If specified, interactions (absolute value) below this value are discarded
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+            The sources, targets, weights and pvalues of the links
+        """
+        interaction_mat = interactions.values
+        mask = interaction_mat != 0
+        # If undirected only the upper triangular matrix is used
+        if not directed:
+            mask = np.triu(mask)
+        if interaction_threshold is not None:
+            mask &= np.abs(interaction_mat) >= abs(interaction_threshold)
+        row_inds, col_inds = mask.nonzero()
+        sources = interactions.index.values[row_inds]
+        targets = interactions.columns.values[col_inds]
+        weights = interaction_mat[row_inds, col_inds].astype(float)
+        if pvalues is not None:
+            pvalue_arr = pvalues.values[row_inds, col_inds].astype(float)
+        else:
+            pvalue_arr = np.full(len(row_inds), np.nan)
+        return sources, targets, weights, pvalue_arr
+
     @classmethod
     def load_data(
         cls,
@@ -435,6 +865,7 @@ class Network:
         pvalue_threshold: float = 0.05,
         pvalue_correction: Optional[str] = "fdr_bh",
         directed: bool = False,
+        prefilter: bool = False,
     ) -> "Network":
         """
         Create a `Network` object from files (interaction tables and other metadata)
@@ -472,6 +903,11 @@ class Network:
         directed : bool
             True if network is directed
             Default value is False
+        prefilter : bool, optional
+            True if interactions below `interaction_threshold` are to be discarded
+            when the links are extracted from the interaction matrix
+            Note that the pvalue correction is then only applied to the remaining links
+            Default value is False
 
         Returns
         -------
@@ -493,26 +929,14 @@ class Network:
             pvalue_validator.validate(pvalues)
         else:
             pvalues = None
-        # If undirected convert to upper triangular matrix
-        if directed:
-            interaction_mat = interactions.values
-        else:
-            interaction_mat = np.triu(interactions.values)
-        row_inds, col_inds = interaction_mat.nonzero()
         # Calculate nodes and links
         nodes = list(interactions.index)
-        links: List[LinkDType] = []
-        for rind, cind in zip(row_inds, col_inds):
-            links.append(
-                (
-                    interactions.index[rind],
-                    interactions.columns[cind],
-                    {
-                        "weight": interactions.iloc[rind, cind],
-                        "pvalue": pvalues.iloc[rind, cind] if pvalue_file else np.nan,
-                    },
-                )
-            )
+        sources, targets, weights, pvalue_arr = cls._extract_links(
+            interactions,
+            pvalues,
+            directed,
+            interaction_threshold if prefilter else None,
+        )
         # Load metadata
         with open(meta_file, "r") as fid:
             metadata = simplejson.load(fid)
@@ -533,9 +957,12 @@ class Network:
                 children_map = simplejson.load(fid)
         else:
             children_map = None
-        network = cls(
+        network = cls.from_arrays(
             nodes,
-            links,
+            sources,
+            targets,
+            weights,
+            pvalue_arr,
             metadata,
             cmetadata,
             obs_metadata,
@@ -602,6 +1029,170 @@ class Network:
                 )
             )
 
+    def _to_bundle(
+        self, pvalue_filter: bool = False, interaction_filter: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """
+        Returns the network as a dictionary of arrays for the binary format
+        The nodes are stored column wise, the children of all the nodes are concatenated
+        and the metadata is stored as a `JSON` string
+
+        Parameters
+        ----------
+        pvalue_filter : bool
+            If True will use `pvalue_threshold` for filtering
+            Default  value is False
+        interaction_filter : bool
+            If True will use `interaction_threshold` for filtering
+            Default  value is False
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            The dictionary of arrays representing the network
+        """
+        node_table = self._node_table
+        children = node_table["children"].tolist()
+        bundle = {
+            "node_ids": np.array(node_table["id"].tolist(), dtype=str),
+            "lineage": np.array(node_table["lineage"].tolist(), dtype=str),
+            "name": np.array(node_table["name"].tolist(), dtype=str),
+            "taxid": node_table["taxid"].values.astype(np.int64),
+            "taxlevel": np.array(node_table["taxlevel"].tolist(), dtype=str),
+            "children": np.array(list(chain.from_iterable(children)), dtype=str),
+            "children_offsets": np.cumsum([0, *map(len, children)], dtype=np.int64),
+        }
+        if node_table["abundance"].notnull().any():
+            bundle["abundance"] = node_table["abundance"].values.astype(float)
+        mask = self.edge_mask(
+            pvalue_filter=pvalue_filter, interaction_filter=interaction_filter
+        )
+        bundle["sources"] = self._sources[mask]
+        bundle["targets"] = self._targets[mask]
+        bundle["weights"] = self._weights[mask]
+        bundle["pvalues"] = self._pvalues[mask]
+        bundle["metadata"] = np.array(
+            simplejson.dumps(self.metadata, sort_keys=True, ignore_nan=True)
+        )
+        return bundle
+
+    def write_binary(
+        self, fpath: str, pvalue_filter: bool = False, interaction_filter: bool = False
+    ) -> None:
+        """
+        Write network to file in the binary (`npz`) format
+
+        Parameters
+        ----------
+        fpath : str
+            The path to the `npz` file
+        pvalue_filter : bool
+            If True will use `pvalue_threshold` for filtering
+            Default  value is False
+        interaction_filter : bool
+            If True will use `interaction_threshold` for filtering
+            Default  value is False
+        """
+        bundle = self._to_bundle(
+            pvalue_filter=pvalue_filter, interaction_filter=interaction_filter
+        )
+        with open(fpath, "wb") as fid:
+            np.savez(fid, **bundle)
+
+    @classmethod
+    def _from_bundle(cls, bundle: Mapping[str, np.ndarray]) -> "Network":
+        """
+        Create a `Network` object from a dictionary of arrays in the binary format
+        The node properties and links are used as they are without validation
+
+        Parameters
+        ----------
+        bundle : Mapping[str, np.ndarray]
+            The dictionary of arrays representing the network
+
+        Returns
+        -------
+        Network
+            The instance of the `Network` class
+        """
+        metadata = simplejson.loads(bundle["metadata"].item())
+        networkmetadata_model = NetworkmetadataModel(metadata, strict=False)
+        networkmetadata_model.validate()
+        node_ids = pd.Index(bundle["node_ids"].tolist(), dtype=object)
+        sources, targets = bundle["sources"], bundle["targets"]
+        if len(sources) and max(sources.max(), targets.max()) >= len(node_ids):
+            raise ValueError("Links of the network refer to missing nodes")
+        children = bundle["children"].tolist()
+        offsets = bundle["children_offsets"].tolist()
+        if "abundance" in bundle:
+            abundance = bundle["abundance"]
+        else:
+            abundance = [None] * len(node_ids)
+        node_table = pd.DataFrame(
+            {
+                "id": node_ids,
+                "lineage": bundle["lineage"].astype(object),
+                "name": bundle["name"].astype(object),
+                "taxid": bundle["taxid"],
+                "taxlevel": bundle["taxlevel"].astype(object),
+                "abundance": abundance,
+                "children": [children[i:j] for i, j in zip(offsets, offsets[1:])],
+            },
+            index=node_ids,
+            columns=NODE_FIELDS,
+        )
+        cmetadata = metadata["computational_metadata"]
+        network = cls._from_node_table(
+            node_table,
+            sources.astype(np.int32),
+            targets.astype(np.int32),
+            bundle["weights"].astype(float),
+            bundle["pvalues"].astype(float),
+            metadata,
+            cmetadata["interaction_threshold"],
+            cmetadata["pvalue_threshold"],
+        )
+        return network
+
+    @classmethod
+    def load_binary(cls, fpath: str) -> "Network":
+        """
+        Create a `Network` object from a network file in the binary (`npz`) format
+
+        Parameters
+        ----------
+        fpath : str
+            The path to the network `npz` file
+
+        Returns
+        -------
+        Network
+            The instance of the `Network` class
+        """
+        with np.load(fpath) as data:
+            bundle = dict(data.items())
+        return cls._from_bundle(bundle)
+
+    @classmethod
+    def load(cls, fpath: str) -> "Network":
+        """
+        Create a `Network` object from a network file
+        Files with the `npz` extension are read in the binary format and the rest as `JSON`
+
+        Parameters
+        ----------
+        fpath : str
+            The path to the network file
+
+        Returns
+        -------
+        Network
+            The instance of the `Network` class
+        """
+        if str(fpath).endswith(BINARY_SUFFIX):
+            return cls.load_binary(fpath)
+        return cls.load_json(fpath)
+
     @classmethod
     def load_json(
         cls, fpath: Optional[str] = None, raw_data: Optional[dict] = None
@@ -630,12 +1221,52 @@ class Network:
         else:
             data = raw_data
         # Validation
-        nodes_model = NodesModel({"nodes": data["nodes"]}, strict=False)
-        nodes_model.validate()
         links_model = LinksModel({"links": data["links"]}, strict=False)
         links_model.validate()
-        non_meta_keys = ["nodes", "links"]
-        metadata = {k: v for k, v in data.items() if k not in non_meta_keys}
+        links = data["links"]
+        return cls._from_json_data(
+            {k: v for k, v in data.items() if k != "links"},
+            [link["source"] for link in links],
+            [link["target"] for link in links],
+            np.array([link["weight"] for link in links], dtype=float),
+            np.array([link["pvalue"] for link in links], dtype=float),
+        )
+
+    @classmethod
+    def _from_json_data(
+        cls,
+        data: dict,
+        sources: List[str],
+        targets: List[str],
+        weights: np.ndarray,
+        pvalues: np.ndarray,
+    ) -> "Network":
+        """
+        Create a `Network` object from the data of a network `JSON` file
+        The links are passed as arrays instead of being part of the data
+
+        Parameters
+        ----------
+        data : dict
+            The raw data stored in the network `JSON` file without the links
+        sources : List[str]
+            The source node of every link
+        targets : List[str]
+            The target node of every link
+        weights : np.ndarray
+            The weight of every link, missing weights are NaN
+        pvalues : np.ndarray
+            The pvalue of every link, missing pvalues are NaN
+
+        Returns
+        -------
+        Network
+            The instance of the `Network` class
+        """
+        # Validation
+        nodes_model = NodesModel({"nodes": data["nodes"]}, strict=False)
+        nodes_model.validate()
+        metadata = {k: v for k, v in data.items() if k != "nodes"}
         networkmetadata_model = NetworkmetadataModel(metadata, strict=False)
         networkmetadata_model.validate()
         # Variable assignment
@@ -646,7 +1277,6 @@ class Network:
         pvalue_correction = None
         directed = data["directionality"] == "directed"
         nodes: List[str] = []
-        links: List[LinkDType] = []
         lineages: List[dict] = []
         children_map: Dict[str, List[str]] = {}
         for node in data["nodes"]:
@@ -659,20 +1289,12 @@ class Network:
             else:
                 lineages.append(lineage)
         obs_metadata = pd.DataFrame(lineages, index=nodes)
-        for link in data["links"]:
-            source, target = link["source"], link["target"]
-            if link["weight"] is None:
-                weight = np.nan
-            else:
-                weight = link["weight"]
-            if link["pvalue"] is None:
-                pvalue = np.nan
-            else:
-                pvalue = link["pvalue"]
-            links.append((source, target, {"weight": weight, "pvalue": pvalue}))
-        network = cls(
+        network = cls.from_arrays(
             nodes,
-            links,
+            sources,
+            targets,
+            weights,
+            pvalues,
             metadata,
             cmetadata,
             obs_metadata,
@@ -2,22 +2,180 @@
     Module that defines the `NetworkGroup` object and methods to read, write and manipulate it
 """
 
+import copy
+import multiprocessing as mp
+import os
 import pathlib
-from collections import Counter, defaultdict
-from collections.abc import Collection
-from itertools import product
-from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import re
+from collections import defaultdict
+from collections.abc import Collection, Sequence
+from itertools import product, repeat
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import networkx as nx
 import numpy as np
 import pandas as pd
 import simplejson
-from scipy.stats import chi2, pearsonr
+from scipy import sparse
+from scipy.stats import chi2, norm
 
-from .network import Network
+from ..validation import NetworkmetadataModel
+from .lineage import Lineage
+from .network import BINARY_SUFFIX, NODE_FIELDS, Network
 
 DType = List[Dict[str, Any]]
 
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# The arrays of a store that map the nodes and links of the contexts to the group
+STORE_ARRAYS = [
+    "node_maps",
+    "node_map_offsets",
+    "link_edges",
+    "link_edge_offsets",
+    "edge_keys",
+]
+
+
+class _JSONStream:
+    """
+    Incremental reader of a `JSON` document that decodes one value at a time
+    Only the current value and one chunk of the file are held in memory
+
+    Parameters
+    ----------
+    fid : IO[str]
+        The open `JSON` file
+    chunk_size : int
+        The number of characters read from the file at a time
+        Default value is 1048576
+    """
+
+    def __init__(self, fid: IO[str], chunk_size: int = 2**20) -> None:
+        self._fid = fid
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._decoder = simplejson.JSONDecoder()
+
+    def _read_chunk(self) -> bool:
+        """Append the next chunk of the file to the buffer, False at the end of the file"""
+        chunk = self._fid.read(self._chunk_size)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_chunk():
+                raise ValueError("Unexpected end of the JSON document")
+
+    def _consume(self, chars: str) -> str:
+        """Consume the next character, which must be one of `chars`"""
+        char = self._peek()
+        if char not in chars:
+            raise ValueError(f"Expected one of {chars!r} but found {char!r}")
+        self._pos += 1
+        return char
+
+    def decode(self) -> Any:
+        """Decode the next value"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except simplejson.JSONDecodeError:
+                if self._read_chunk():
+                    continue
+                raise
+            # NOTE: A number at the end of the buffer could continue in the next chunk
+            if end == len(self._buffer) and self._read_chunk():
+                continue
+            self._pos = end
+            return value
+
+    def iter_array(self) -> Iterator[Any]:
+        """Decode the elements of the next array one at a time"""
+        self._consume("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.decode()
+            if self._consume(",]") == "]":
+                return
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Decode the keys of the next object one at a time
+        The value of every key must be read before the next key is requested
+        """
+        self._consume("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.decode()
+            self._consume(":")
+            yield key
+            if self._consume(",}") == "}":
+                return
+
+
+class _NetworkStore(Sequence):
+    """
+    Sequence of the networks of the contexts of a `NetworkGroup`
+    Every network is either held in memory or stored in a binary (`npz`) file
+    The stored networks are read on every access and are never held in memory
+
+    Parameters
+    ----------
+    networks : List[Union[Network, pathlib.Path]]
+        The networks or the paths of the network files
+    """
+
+    def __init__(self, networks: Iterable[Union[Network, pathlib.Path]] = ()) -> None:
+        self._networks: List[Union[Network, pathlib.Path]] = list(networks)
+
+    def __len__(self) -> int:
+        return len(self._networks)
+
+    def __getitem__(self, cid: int) -> Network:
+        network = self._networks[cid]
+        if isinstance(network, Network):
+            return network
+        return Network.load_binary(str(network))
+
+    def append(self, network: Network) -> None:
+        """Add a network to the end of the sequence"""
+        self._networks.append(network)
+
+    def copy(self) -> "_NetworkStore":
+        """Returns a shallow copy of the sequence, the stored networks are not read"""
+        return _NetworkStore(self._networks)
+
+    def path(self, cid: int) -> Optional[pathlib.Path]:
+        """The path of the file of the network if it is stored and None otherwise"""
+        network = self._networks[cid]
+        return None if isinstance(network, Network) else network
+
 
 class NetworkGroup(Collection):
     """
@@ -37,20 +195,42 @@ class NetworkGroup(Collection):
     ----------
     graph : Union[nx.MultiGraph, nx.MultiDiGraph]
         The networkx multi-graph representation of the network
+
+    Notes
+    -----
+    The links of the networks are mapped to the edges of the group through integer
+    arrays of node positions. The networkx multi-graph is only created on first access
+    Networks added with `add_network` or `extend` are merged into the existing tables
+    Groups written with `write_store` are opened with `open`, which reads the networks
+    of the contexts only when they are accessed
     """
 
     def __init__(self, networks: List[Network], id_field: str = "taxid") -> None:
         self.id_field = id_field
-        # dict(cid => dict(id_old => id_new))
-        self.nodeid_map: Dict[int, Dict[str, str]] = dict()
-        # dict(s_new-t_new => List[Tuple[cid, s_old-t_old], ...])
-        self.linkid_revmap: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
-        self._networks = tuple(networks)
         if not networks or [n for n in networks if not isinstance(n, Network)]:
             raise ValueError(
                 "The networks parameter must be a list of one or more networks"
             )
-        self.graph = self._combine_networks(networks)
+        self._reset()
+        self.extend(networks)
+
+    def _reset(self) -> None:
+        """Remove all the networks from the group"""
+        self._networks = _NetworkStore()
+        self._contexts: DType = []
+        self._nodes: DType = []
+        # dict(node[id_field] => node_position_new)
+        self._node_hash: Dict[Any, int] = dict()
+        # list(cid => array(node_position_old => node_position_new))
+        self._node_maps: List[np.ndarray] = []
+        # dict(source_new << 32 | target_new => edge), None until it is first needed
+        self._edge_hash: Optional[Dict[int, int]] = dict()
+        # list(edge_key, ...) in chunks, one chunk per context
+        self._edge_keys: List[np.ndarray] = []
+        # list(cid => array(link_position => edge))
+        self._link_edges: List[np.ndarray] = []
+        self._directed = True
+        self._graph: Optional[Union[nx.MultiGraph, nx.MultiDiGraph]] = None
 
     def __contains__(self, key) -> bool:
         if key in range(len(self)):
@@ -63,9 +243,12 @@ class NetworkGroup(Collection):
     def __iter__(self) -> Iterator:
         return iter(self._networks)
 
+    def __getitem__(self, cid: int) -> Network:
+        return self._networks[cid]
+
     def __repr__(self) -> str:
-        n_nodes = len(self.nodes)
-        n_links = len(self.links)
+        n_nodes = len(self._nodes)
+        n_links = sum(len(link_edges) for link_edges in self._link_edges)
         n_contexts = len(self.contexts)
         return f"<NetworkGroup contexts={n_contexts} nodes={n_nodes} links={n_links}>"
 
@@ -75,111 +258,215 @@ class NetworkGroup(Collection):
         """
         if self.id_field != other.id_field:
             raise ValueError("Cannot add two NetworkGroups with different id_fields")
-        networks = [*self._networks, *other._networks]
-        return NetworkGroup(networks, id_field=self.id_field)
-
-    def _combine_nodes(self, all_nodes: Dict[int, DType]) -> DType:
-        """Combine nodes of individual networks into a single list"""
-        nodes: DType = []
-        node_hash: Dict[int, int] = dict()  # taxid => nodes.index
-        if len(all_nodes) == 1:
-            return all_nodes[0]
-        for cid, network_nodes in all_nodes.items():
-            self.nodeid_map[cid] = dict()
-            for network_node in network_nodes:
-                if network_node[self.id_field] not in node_hash:
-                    id_ = len(nodes)
-                    id_old = network_node["id"]
-                    id_new = f"id{id_}"
-                    nodes.append(
-                        {
-                            **network_node,
-                            **{"id": id_new, "children": [], "abundance": None},
-                        }
-                    )
-                    node_hash[network_node[self.id_field]] = id_
-                    self.nodeid_map[cid][id_old] = id_new
-                else:
-                    id_old = network_node["id"]
-                    ind = node_hash[network_node[self.id_field]]
-                    id_new = nodes[ind]["id"]
-                    self.nodeid_map[cid][id_old] = id_new
-        return nodes
-
-    def _combine_links(
-        self, all_links: Dict[int, DType], inplace: bool = True
-    ) -> DType:
-        """Combine links of individual networks into a single list"""
-        links = []
-        if len(all_links) == 1:
-            for link in all_links[0]:
-                source, target = link["source"], link["target"]
-                if inplace:
-                    self.linkid_revmap[f"{source}-{target}"].append(
-                        (0, f"{source}-{target}")
-                    )
-                links.append({**link, "context_index": 0})
-            return links
-        for cid, network_links in all_links.items():
-            for link in network_links:
-                source, target = link["source"], link["target"]
-                new_source = self.nodeid_map[cid][source]
-                new_target = self.nodeid_map[cid][target]
-                if inplace:
-                    self.linkid_revmap[f"{new_source}-{new_target}"].append(
-                        (cid, f"{source}-{target}")
-                    )
-                links.append(
-                    {
-                        **link,
-                        **{
-                            "source": new_source,
-                            "target": new_target,
-                            "context_index": cid,
-                        },
-                    }
-                )
-        return links
+        new_group = copy.copy(self)
+        for attr in ["_contexts", "_nodes", "_node_maps", "_edge_keys", "_link_edges"]:
+            setattr(new_group, attr, list(getattr(self, attr)))
+        new_group._networks = self._networks.copy()
+        new_group._node_hash = dict(self._node_hash)
+        if self._edge_hash is not None:
+            new_group._edge_hash = dict(self._edge_hash)
+        new_group._graph = None
+        new_group.extend(other._networks)
+        return new_group
 
-    def _combine_networks(
-        self, networks: List[Network]
-    ) -> Union[nx.MultiGraph, nx.MultiDiGraph]:
+    def add_network(self, network: Network) -> None:
         """
-        Combine networks into a network group
+        Add a network to the group as a new context
+        Only the nodes and links of the new network are merged into the group
+
+        Parameters
+        ----------
+        network : Network
+            The network to be added
+        """
+        self.extend([network])
+
+    def extend(self, networks: List[Network]) -> None:
+        """
+        Add networks to the group as new contexts
+        Only the nodes and links of the new networks are merged into the group
 
         Parameters
         ----------
         networks : List[Network]
-            The list of networks to be grouped
+            The list of networks to be added
+        """
+        networks = list(networks)
+        if [n for n in networks if not isinstance(n, Network)]:
+            raise ValueError("The networks parameter must be a list of networks")
+        if not networks:
+            return
+        directed = all(
+            network.metadata["directionality"] == "directed" for network in networks
+        )
+        # NOTE: The node ids of a single network are only replaced when it is grouped and
+        # the edges of a directed group are reoriented when it becomes undirected
+        if len(self._networks) == 1 or (
+            self._networks and self._directed and not directed
+        ):
+            networks = [*self._networks, *networks]
+            self._reset()
+            directed = all(
+                network.metadata["directionality"] == "directed" for network in networks
+            )
+        self._directed = self._directed and directed
+        rename = len(self._networks) + len(networks) > 1
+        for network in networks:
+            self._merge_network(network, rename)
+        self._graph = None
+
+    def _merge_network(self, network: Network, rename: bool) -> None:
+        """Merge the nodes and links of a network into the group as a new context"""
+        self._networks.append(network)
+        self._contexts.append(network.metadata)
+        self._node_maps.append(self._combine_nodes(network, rename))
+        self._link_edges.append(self._combine_edges(network))
+
+    def _combine_nodes(self, network: Network, rename: bool) -> np.ndarray:
+        """
+        Combine nodes of a network with the nodes of the group
+
+        Returns
+        -------
+        np.ndarray
+            The positions of the nodes of the network in `nodes`
+        """
+        if not rename:
+            self._nodes.extend(network.nodes)
+            return np.arange(len(network.node_ids))
+        keys = network.node_table[self.id_field].tolist()
+        node_map = np.fromiter(
+            map(self._node_hash.get, keys, repeat(-1)), dtype=np.int64, count=len(keys)
+        )
+        new_positions: List[int] = []
+        for ind in np.flatnonzero(node_map < 0).tolist():
+            if keys[ind] not in self._node_hash:
+                self._node_hash[keys[ind]] = len(self._nodes) + len(new_positions)
+                new_positions.append(ind)
+            node_map[ind] = self._node_hash[keys[ind]]
+        new_nodes = network.node_table.iloc[new_positions].to_dict("records")
+        for id_, node in enumerate(new_nodes, start=len(self._nodes)):
+            node.update({"id": f"id{id_}", "children": [], "abundance": None})
+        self._nodes.extend(new_nodes)
+        return node_map
+
+    def _combine_edges(self, network: Network) -> np.ndarray:
+        """
+        Combine the links of a network with the edges of the group
+        For undirected groups the nodes of an edge are in the order of `nodes`
+
+        Returns
+        -------
+        np.ndarray
+            The edges that correspond to the links of the network
+        """
+        node_map = self._node_maps[-1]
+        sources = node_map[network.sources].astype(np.int64)
+        targets = node_map[network.targets].astype(np.int64)
+        if not self._directed:
+            sources, targets = (
+                np.minimum(sources, targets),
+                np.maximum(sources, targets),
+            )
+        keys, inverse = np.unique((sources << 32) | targets, return_inverse=True)
+        if self._edge_hash is None:
+            edge_keys = np.concatenate(self._edge_keys).tolist()
+            self._edge_hash = dict(zip(edge_keys, range(len(edge_keys))))
+        edges = np.fromiter(
+            map(self._edge_hash.get, keys.tolist(), repeat(-1)),
+            dtype=np.int64,
+            count=len(keys),
+        )
+        # NOTE: The edges are numbered in the order in which they first occur
+        new = edges < 0
+        n_edges = len(self._edge_hash)
+        edges[new] = np.arange(n_edges, n_edges + new.sum())
+        self._edge_hash.update(zip(keys[new].tolist(), edges[new].tolist()))
+        self._edge_keys.append(keys[new])
+        return edges[inverse.ravel()]
+
+    def _combine_links(self, masks: Optional[List[np.ndarray]] = None) -> DType:
+        """Combine links (selected by `masks`) of individual networks into a single list"""
+        return list(self._iter_links(masks))
+
+    def _iter_links(self, masks: Optional[List[np.ndarray]] = None) -> Iterator[dict]:
+        """Iterate over the links (selected by `masks`) of individual networks"""
+        node_ids = np.array([node["id"] for node in self._nodes], dtype=object)
+        for cid, network in enumerate(self._networks):
+            mask = None if masks is None else masks[cid]
+            sources, targets = network.sources, network.targets
+            if mask is not None:
+                sources, targets = sources[mask], targets[mask]
+            node_map = self._node_maps[cid]
+            for link, new_source, new_target in zip(
+                network._get_links(mask),
+                node_ids[node_map[sources]],
+                node_ids[node_map[targets]],
+            ):
+                yield {
+                    **link,
+                    **{
+                        "source": new_source,
+                        "target": new_target,
+                        "context_index": cid,
+                    },
+                }
+
+    @property
+    def _link_table(self) -> pd.DataFrame:
+        """The table of (context => edge), one row per link"""
+        return pd.DataFrame(
+            {
+                "context": np.repeat(
+                    np.arange(len(self)), [len(edges) for edges in self._link_edges]
+                ),
+                "edge": np.concatenate(self._link_edges),
+            }
+        )
+
+    @property
+    def _edges(self) -> pd.DataFrame:
+        """The table of (source_new, target_new), one row per edge of the group"""
+        edge_keys = np.concatenate(self._edge_keys)
+        return pd.DataFrame(
+            {"source": edge_keys >> 32, "target": edge_keys & 0xFFFFFFFF}
+        )
+
+    def _context_edges(self, cid: int) -> np.ndarray:
+        """The edges of the group that correspond to the links of the context `cid`"""
+        return self._link_edges[cid]
+
+    def _combine_networks(self) -> Union[nx.MultiGraph, nx.MultiDiGraph]:
+        """
+        Combine the merged nodes and links of the networks into a multi-graph
 
         Returns
         -------
         Union[nx.MultiGraph, nx.MultiDiGraph]
             The networkx graph of the network
         """
-        nodes_dict = dict()
-        links_dict = dict()
-        contexts = []
-        for cid, network in enumerate(networks):
-            nodes_dict[cid] = network.nodes
-            links_dict[cid] = network.links
-            contexts.append(network.metadata)
-        merged_nodes = self._combine_nodes(nodes_dict)
-        merged_links = self._combine_links(links_dict)
-        if all([n.graph.is_directed() for n in networks]):
-            graph = nx.MultiDiGraph(contexts=contexts)
+        merged_links = self._combine_links()
+        if self._directed:
+            graph = nx.MultiDiGraph(contexts=self._contexts)
         else:
-            graph = nx.MultiGraph(contexts=contexts)
-        for node in merged_nodes:
+            graph = nx.MultiGraph(contexts=self._contexts)
+        for node in self._nodes:
             graph.add_node(node["id"], **node)
         for link in merged_links:
             graph.add_edge(link["source"], link["target"], **link)
         return graph
 
+    @property
+    def graph(self) -> Union[nx.MultiGraph, nx.MultiDiGraph]:
+        """The networkx multi-graph representation of the network, created on first access"""
+        if self._graph is None:
+            self._graph = self._combine_networks()
+        return self._graph
+
     @property
     def nodes(self) -> DType:
         """The list of nodes in the `NetworkGroup` and their corresponding properties"""
-        return [data for _, data in self.graph.nodes(data=True)]
+        return [dict(node) for node in self._nodes]
 
     @property
     def links(self) -> DType:
@@ -189,11 +476,63 @@ class NetworkGroup(Collection):
     @property
     def contexts(self) -> DType:
         """The contexts for the group of networks"""
-        return self.graph.graph["contexts"]
+        return self._contexts
+
+    def get_sparse_adjacency_vectors(
+        self, key: str, cids: Optional[List[int]] = None
+    ) -> Tuple[sparse.csr_matrix, pd.DataFrame]:
+        """
+        Returns the adjacency vectors of the contexts as a sparse matrix
+        The rows are the pairs of nodes that are linked in at least one context
+        and the columns are the contexts
+        For undirected networks the nodes of a pair are in the order of `nodes`
+
+        Parameters
+        ----------
+        key : {'weight', 'pvalue'}
+            The `edge` property to be used to contruct the vectors
+        cids : Optional[List[int]]
+            The list of context ids of the columns, only these networks are read
+            Default is None which uses all the contexts
+
+        Returns
+        -------
+        Tuple[sparse.csr_matrix, pd.DataFrame]
+            The sparse matrix of adjacency vectors and the table of node pairs
+            The table contains the positions of the nodes in `nodes` as 'source'
+            and 'target' columns
+        """
+        if key not in {"weight", "pvalue"}:
+            raise ValueError("The key must be either 'weight' or 'pvalue'")
+        if cids is None:
+            cids = list(range(len(self)))
+        values = np.concatenate(
+            [
+                self._networks[cid].weights
+                if key == "weight"
+                else self._networks[cid].pvalues
+                for cid in cids
+            ]
+        )
+        edges = self._edges
+        rows = np.concatenate([self._context_edges(cid) for cid in cids])
+        n_contexts = len(cids)
+        contexts = np.repeat(
+            np.arange(n_contexts), [len(self._context_edges(cid)) for cid in cids]
+        )
+        # NOTE: Repeated links between a pair of nodes in one context keep the last value
+        _, last = np.unique((rows * n_contexts + contexts)[::-1], return_index=True)
+        last = len(rows) - 1 - last
+        adj_vectors = sparse.csr_matrix(
+            (values[last], (rows[last], contexts[last])),
+            shape=(len(edges), n_contexts),
+        )
+        return adj_vectors, edges
 
     def get_adjacency_vectors(self, key: str) -> pd.DataFrame:
         """
         Returns the adjacency matrix for each context as a `pd.DataFrame`
+        This is the dense and labeled version of `get_sparse_adjacency_vectors`
 
         Parameters
         ----------
@@ -205,25 +544,15 @@ class NetworkGroup(Collection):
         pd.DataFrame:
             The DataFrame containing adjacency vectors as columns
         """
-        ids = list(self.graph.nodes)
-        size = len(ids) * len(ids)
+        adj_vectors, pairs = self.get_sparse_adjacency_vectors(key)
+        ids = [node["id"] for node in self.nodes]
         # NOTE: This will consider id1-id2 and id2-id1 as different (even for undirected)
         index = [f"{id1}-{id2}" for id1, id2 in product(ids, repeat=2)]
-        n_contexts = len(self)
-        adj_vector_df: pd.DataFrame = pd.concat(
-            [
-                pd.Series(np.zeros((size), dtype=float), index=index)
-                for _ in range(n_contexts)
-            ],
-            join="outer",
-            axis=1,
-        )
-        graph = self.graph
-        # NOTE: networkx automatically handles directionality (source -> target) here
-        for source, target, data in graph.edges(data=True, keys=False):
-            cid = data["context_index"]
-            id_ = f"{source}-{target}"
-            adj_vector_df.loc[id_, cid] = data[key]
+        data = np.zeros((len(index), len(self)), dtype=float)
+        data[
+            pairs["source"].values * len(ids) + pairs["target"].values
+        ] = adj_vectors.toarray()
+        adj_vector_df = pd.DataFrame(data=data, index=index)
         return adj_vector_df
 
     def update_thresholds(
@@ -241,16 +570,18 @@ class NetworkGroup(Collection):
             This is the `alpha` value for pvalue cutoff
             Default value is 0.05
         """
-        for context in self.graph.graph["contexts"]:
+        for context in self.contexts:
             context["interaction_threshold"] = interaction_threshold
             context["pvalue_threshold"] = pvalue_threshold
         for network in self._networks:
             network.interaction_threshold = interaction_threshold
             network.pvalue_threshold = pvalue_threshold
 
-    def _filter_links(self, pvalue_filter: bool, interaction_filter: bool) -> DType:
+    def _filter_links(
+        self, pvalue_filter: bool, interaction_filter: bool
+    ) -> Iterator[dict]:
         """
-        The links of the networks after applying filtering
+        Iterate over the links of the networks after applying filtering
 
         Parameters
         ----------
@@ -259,21 +590,22 @@ class NetworkGroup(Collection):
         interaction_filter : bool
             If True will use `interaction_threshold` for filtering
 
-        Returns
-        -------
-        DType
-            The list of links in the network after applying thresholds
+        Yields
+        ------
+        dict
+            The links in the network after applying thresholds
         """
-        filtered_links_dict = dict()
-        for cid, network in enumerate(self._networks):
-            filtered_links_dict[cid] = network._filter_links(
+        masks = [
+            network.edge_mask(
                 pvalue_filter=pvalue_filter, interaction_filter=interaction_filter
             )
-        merged_filtered_links = self._combine_links(filtered_links_dict, inplace=False)
-        return merged_filtered_links
+            for network in self._networks
+        ]
+        return self._iter_links(masks=masks)
 
     def filter(self, pvalue_filter: bool, interaction_filter: bool) -> "NetworkGroup":
         """Filter network using pvalue and interaction thresholds
+        The networks of every context are filtered without reloading them
 
         Parameters
         ----------
@@ -287,17 +619,13 @@ class NetworkGroup(Collection):
         "NetworkGroup"
             The filtered `NetworkGroup` object
         """
-        nodes = {"nodes": self.nodes}
-        links = {
-            "links": self._filter_links(
+        networks = [
+            network.filter(
                 pvalue_filter=pvalue_filter, interaction_filter=interaction_filter
             )
-        }
-        contexts = {"contexts": self.contexts}
-        network_data = {**contexts, **nodes, **links}
-        new_network = NetworkGroup.load_json(
-            raw_data=network_data, id_field=self.id_field
-        )
+            for network in self._networks
+        ]
+        new_network = NetworkGroup(networks, id_field=self.id_field)
         return new_network
 
     def json(
@@ -320,13 +648,41 @@ class NetworkGroup(Collection):
         str
             The `JSON` string representation of the network
         """
+        return "".join(
+            self._iter_json(
+                pvalue_filter=pvalue_filter, interaction_filter=interaction_filter
+            )
+        )
+
+    def _iter_json(
+        self, pvalue_filter: bool, interaction_filter: bool
+    ) -> Iterator[str]:
+        """
+        Iterate over the chunks of the `JSON` string representation of the network
+        The links are encoded as they are generated and never held in memory together
+
+        Parameters
+        ----------
+        pvalue_filter : bool
+            If True will use `pvalue_threshold` for filtering
+        interaction_filter : bool
+            If True will use `interaction_threshold` for filtering
+
+        Returns
+        -------
+        Iterator[str]
+            The consecutive chunks of the `JSON` string
+        """
         nodes = self.nodes
         links = self._filter_links(
             pvalue_filter=pvalue_filter, interaction_filter=interaction_filter
         )
         contexts = self.contexts
         network = {"contexts": contexts, "nodes": nodes, "links": links}
-        return simplejson.dumps(network, indent=2, sort_keys=True, ignore_nan=True)
+        encoder = simplejson.JSONEncoder(
+            indent=2, sort_keys=True, ignore_nan=True, iterable_as_array=True
+        )
+        return encoder.iterencode(network)
 
     def write(
         self,
@@ -337,6 +693,7 @@ class NetworkGroup(Collection):
     ) -> None:
         """
         Write network to file as JSON
+        Files with the `npz` extension are written in the binary format instead
 
         Parameters
         ----------
@@ -352,71 +709,245 @@ class NetworkGroup(Collection):
             If True will write networks into separate files
             Default value is False
         """
+        binary = str(fpath).endswith(BINARY_SUFFIX)
         if not split_files:
-            with open(fpath, "w") as fid:
-                fid.write(
-                    self.json(
-                        pvalue_filter=pvalue_filter,
-                        interaction_filter=interaction_filter,
-                    )
+            if binary:
+                self.write_binary(
+                    fpath,
+                    pvalue_filter=pvalue_filter,
+                    interaction_filter=interaction_filter,
                 )
+            else:
+                with open(fpath, "w") as fid:
+                    fid.writelines(
+                        self._iter_json(
+                            pvalue_filter=pvalue_filter,
+                            interaction_filter=interaction_filter,
+                        )
+                    )
         else:
             for cid, network in enumerate(self._networks):
                 path = pathlib.Path(fpath)
                 fname = f"{path.parent}/{cid}_{path.stem}{path.suffix}"
-                network.write(
-                    fname,
-                    pvalue_filter=pvalue_filter,
-                    interaction_filter=interaction_filter,
-                )
+                if binary:
+                    network.write_binary(
+                        fname,
+                        pvalue_filter=pvalue_filter,
+                        interaction_filter=interaction_filter,
+                    )
+                else:
+                    network.write(
+                        fname,
+                        pvalue_filter=pvalue_filter,
+                        interaction_filter=interaction_filter,
+                    )
 
-    def to_network(self, method: str = "mean") -> Network:
-        if method == "mean":
-            method_func = np.mean
-        else:
-            raise NotImplemented("Only mean is supported right now")
+    def write_binary(
+        self, fpath: str, pvalue_filter: bool = False, interaction_filter: bool = False
+    ) -> None:
+        """
+        Write network to file in the binary (`npz`) format
+        The networks of every context are stored with their original node ids
+
+        Parameters
+        ----------
+        fpath : str
+            The path to the `npz` file
+        pvalue_filter : bool
+            If True will use `pvalue_threshold` for filtering
+            Default  value is False
+        interaction_filter : bool
+            If True will use `interaction_threshold` for filtering
+            Default  value is False
+        """
+        bundle: Dict[str, np.ndarray] = dict()
+        for cid, network in enumerate(self._networks):
+            network_bundle = network._to_bundle(
+                pvalue_filter=pvalue_filter, interaction_filter=interaction_filter
+            )
+            for key, value in network_bundle.items():
+                bundle[f"{cid}/{key}"] = value
+        with open(fpath, "wb") as fid:
+            np.savez(fid, **bundle)
+
+    def write_store(self, path: str) -> None:
+        """
+        Write the group to a directory that can be opened with `NetworkGroup.open`
+        The merged nodes and contexts are written to 'group.json', the mapping of the
+        links to the edges of the group to one `npy` file per array and the network of
+        every context to its own `npz` file in 'contexts'
+        The networks that are already stored in the directory are not written again
+
+        Parameters
+        ----------
+        path : str
+            The path to the directory
+        """
+        store = pathlib.Path(path)
+        (store / "contexts").mkdir(parents=True, exist_ok=True)
+
+        # NOTE: Files are replaced and not overwritten as they might be memory mapped
+        def replace(fpath: pathlib.Path, write: Callable[[str], None]) -> None:
+            tmp_path = f"{fpath}.tmp"
+            write(tmp_path)
+            os.replace(tmp_path, fpath)
+
+        for cid in range(len(self)):
+            fpath = store / "contexts" / f"{cid}{BINARY_SUFFIX}"
+            stored_path = self._networks.path(cid)
+            if stored_path is not None and stored_path.resolve() == fpath.resolve():
+                continue
+            replace(fpath, self._networks[cid].write_binary)
+        arrays = {
+            "node_maps": np.concatenate(self._node_maps).astype(np.int64),
+            "node_map_offsets": np.cumsum([0, *map(len, self._node_maps)]),
+            "link_edges": np.concatenate(self._link_edges).astype(np.int64),
+            "link_edge_offsets": np.cumsum([0, *map(len, self._link_edges)]),
+            "edge_keys": np.concatenate(self._edge_keys).astype(np.int64),
+        }
+        for name in STORE_ARRAYS:
+            with open(store / f"{name}.npy.tmp", "wb") as fid:
+                np.save(fid, arrays[name])
+            os.replace(store / f"{name}.npy.tmp", store / f"{name}.npy")
+        # NOTE: The keys of the node hash are in the order of the node positions
+        header = {
+            "id_field": self.id_field,
+            "directed": self._directed,
+            "contexts": self._contexts,
+            "nodes": self._nodes,
+            "node_keys": list(self._node_hash),
+        }
+
+        def write_header(fpath: str) -> None:
+            with open(fpath, "w") as fid:
+                simplejson.dump(header, fid, indent=2, sort_keys=True, ignore_nan=True)
+
+        replace(store / "group.json", write_header)
+
+    def to_network(
+        self, method: str = "mean", context_weights: Optional[List[float]] = None
+    ) -> Network:
+        """
+        Flatten the group into a single network with one link per edge of the group
+        The weights and pvalues of the links of every edge are aggregated using `method`
+        Nodes that are not part of any link are removed, unless the flattened network
+        has no links in which case all the nodes of the group are kept
+
+        Parameters
+        ----------
+        method : {'mean', 'median', 'max_abs', 'min_pvalue', 'weighted_mean'}
+            The method used to aggregate the links of an edge
+            'max_abs' keeps the link with the largest absolute weight and
+            'min_pvalue' keeps the link with the smallest pvalue
+            'weighted_mean' weighs the links by the weight of their context
+            Default value is 'mean'
+        context_weights : List[float], optional
+            The weight of every context, required for 'weighted_mean'
+
+        Returns
+        -------
+        Network
+            The flattened network
+        """
+        methods = ["mean", "median", "max_abs", "min_pvalue", "weighted_mean"]
+        if method not in methods:
+            raise ValueError(f"Method {method} not supported. Must be one of {methods}")
+        if method == "weighted_mean" and (
+            context_weights is None or len(context_weights) != len(self)
+        ):
+            raise ValueError("The context_weights must contain one weight per context")
         # Step1: Converge the metadata and cmetadata
-        if isinstance(self.graph, nx.MultiDiGraph):
-            GraphConstructor = nx.DiGraph
-            directionality = "directed"
-        elif isinstance(self.graph, nx.MultiGraph):
-            directionality = "undirected"
-            GraphConstructor = nx.Graph
-        else:
-            raise ValueError("Unknown graph type")
-        emetadata = {}
-        cmetadata = {}
-        metadata_all = {}
+        emetadata: Dict[str, Any] = {}
+        cmetadata: Dict[str, Any] = {}
+        metadata_all: Dict[str, Any] = {}
         for context in self.contexts:
             emetadata |= context["experimental_metadata"]
             cmetadata |= context["computational_metadata"]
-            metadata_all |= context  # type: ignore
-        metadata = {
-            **metadata_all,
-            "experimental_metadata": emetadata,
-            "computational_metadata": cmetadata,
-            "interaction_type": "simple",
-            "directionality": directionality,
-        }
-        networkgroup_graph = self.graph
-        network_graph = GraphConstructor(**metadata)
-        # Step2: Converge the nodes and links
-        network_graph.add_nodes_from(networkgroup_graph.nodes(data=True))
-        network_graph.remove_nodes_from(list(nx.isolates(networkgroup_graph)))
-        for source, target, data in networkgroup_graph.edges(data=True, keys=False):
-            if network_graph.has_edge(source, target):
-                network_graph[source][target]["weight"].append(data.get("weight", 0.0))
-                network_graph[source][target]["pvalue"].append(data.get("pvalue", 1.0))
+            metadata_all |= context
+        metadata = Network._create_metadata(
+            {**metadata_all, "experimental_metadata": emetadata},
+            cmetadata,
+            "simple",
+            self._directed,
+        )
+        networkmetadata_model = NetworkmetadataModel(metadata, strict=False)
+        networkmetadata_model.validate()
+        # Step2: Aggregate the links of every edge
+        link_table = self._link_table
+        edges = link_table["edge"].values
+        weights = np.concatenate([network.weights for network in self._networks])
+        pvalues = np.concatenate([network.pvalues for network in self._networks])
+        edge_keys = np.concatenate(self._edge_keys)
+        counts = np.bincount(edges, minlength=len(edge_keys))
+        starts = np.cumsum(counts) - counts
+        # NOTE: Self-loops are created when linked nodes are merged and are removed
+        present = (counts > 0) & (edge_keys >> 32 != edge_keys & 0xFFFFFFFF)
+        if method in {"mean", "weighted_mean"}:
+            if method == "mean":
+                link_weights = np.ones(len(edges))
             else:
-                weight = data.get("weight", 0.0)
-                pvalue = data.get("pvalue", 1.0)
-                network_graph.add_edge(source, target, weight=[weight], pvalue=[pvalue])
-        for source, target in network_graph.edges:
-            weight = method_func(network_graph[source][target]["weight"])
-            pvalue = method_func(network_graph[source][target]["pvalue"])
-            network_graph[source][target]["weight"] = weight
-            network_graph[source][target]["pvalue"] = pvalue
-        return Network.load_graph(network_graph)
+                link_weights = np.asarray(context_weights, dtype=float)[
+                    link_table["context"].values
+                ]
+            totals = np.bincount(edges, weights=link_weights, minlength=len(edge_keys))
+            edge_weights, edge_pvalues = (
+                np.bincount(
+                    edges, weights=link_weights * values, minlength=len(edge_keys)
+                )
+                / totals
+                for values in (weights, pvalues)
+            )
+        elif method == "median":
+            edge_weights, edge_pvalues = (
+                (
+                    sorted_values[starts + (counts - 1) // 2]
+                    + sorted_values[starts + counts // 2]
+                )
+                / 2
+                for sorted_values in (
+                    values[np.lexsort((values, edges))] for values in (weights, pvalues)
+                )
+            )
+        else:
+            # NOTE: The selected link is the first after sorting the links of every edge
+            if method == "max_abs":
+                order = np.lexsort((-np.abs(weights), edges))
+            else:
+                order = np.lexsort((pvalues, edges))
+            selected = order[np.where(present, starts, 0)]
+            edge_weights, edge_pvalues = weights[selected], pvalues[selected]
+        # Step3: Converge the nodes of the edges
+        sources = (edge_keys >> 32)[present]
+        targets = (edge_keys & 0xFFFFFFFF)[present]
+        node_mask = np.zeros(len(self._nodes), dtype=bool)
+        node_mask[sources] = True
+        node_mask[targets] = True
+        if not len(sources):
+            node_mask[:] = True
+        node_positions = np.cumsum(node_mask) - 1
+        sources, targets = node_positions[sources], node_positions[targets]
+        records = [
+            {**self._nodes[ind], "children": list(self._nodes[ind]["children"])}
+            for ind in np.flatnonzero(node_mask).tolist()
+        ]
+        # NOTE: `from_records` can not build an empty table with an index
+        node_table = pd.DataFrame(
+            records,
+            index=pd.Index([node["id"] for node in records], dtype=object),
+            columns=NODE_FIELDS,
+        )
+        # NOTE: The links are ordered by their source and then their target node
+        order = np.lexsort((targets, sources))
+        return Network._from_node_table(
+            node_table,
+            sources[order].astype(np.int32),
+            targets[order].astype(np.int32),
+            edge_weights[present][order],
+            edge_pvalues[present][order],
+            metadata,
+            cmetadata["interaction_threshold"],
+            cmetadata["pvalue_threshold"],
+        )
 
     @classmethod
     def load_json(
@@ -443,41 +974,240 @@ class NetworkGroup(Collection):
         """
         if not raw_data and not fpath:
             raise ValueError("Either fpath or raw_data must be specified")
+        contexts: DType = []
+        all_node_dict: Dict[str, dict] = dict()
+        # dict(cid => (sources, targets, weights, pvalues))
+        link_columns: Dict[int, Tuple[list, list, list, list]] = defaultdict(
+            lambda: ([], [], [], [])
+        )
+        # NOTE: The node ids of the links share the same string objects
+        node_ids: Dict[str, str] = dict()
+
+        def add_links(links: Iterator[dict]) -> None:
+            """Store the links of every context as columns"""
+            for link in links:
+                columns = link_columns[link["context_index"]]
+                columns[0].append(node_ids.setdefault(link["source"], link["source"]))
+                columns[1].append(node_ids.setdefault(link["target"], link["target"]))
+                columns[2].append(link["weight"])
+                columns[3].append(link["pvalue"])
+
         if not raw_data and fpath:
+            # NOTE: The file is streamed so that the links are never held as dicts
             with open(fpath, "r") as fid:
-                data = simplejson.load(fid)
+                stream = _JSONStream(fid)
+                for key in stream.iter_object():
+                    if key == "contexts":
+                        contexts = stream.decode()
+                    elif key == "nodes":
+                        all_node_dict.update((n["id"], n) for n in stream.iter_array())
+                    elif key == "links":
+                        add_links(stream.iter_array())
+                    else:
+                        stream.decode()
         else:
             data: dict = raw_data
-        n_networks = len(data["contexts"])
-        all_node_dict = {n["id"]: n for n in data["nodes"]}
-        data_dict: Dict[int, dict] = {
-            n: {"nodes": [], "links": [], "metadata": {}} for n in range(n_networks)
-        }
-        unique_node_dict: Dict[int, dict] = {n: set() for n in range(n_networks)}
-        for cid in range(n_networks):
-            data_dict[cid]["metadata"] = {**data["contexts"][cid]}
-        for link in data["links"]:
-            link_cid = link["context_index"]
-            source = all_node_dict[link["source"]]
-            source_name = link["source"]
-            target = all_node_dict[link["target"]]
-            target_name = link["target"]
-            data_dict[link_cid]["links"].append(link)
-            if source_name not in unique_node_dict[link_cid]:
-                data_dict[link_cid]["nodes"].append(source)
-                unique_node_dict[link_cid].add(source_name)
-            if target_name not in unique_node_dict[link_cid]:
-                data_dict[link_cid]["nodes"].append(target)
-                unique_node_dict[link_cid].add(target_name)
+            contexts = data["contexts"]
+            all_node_dict = {n["id"]: n for n in data["nodes"]}
+            add_links(data["links"])
+        if set(link_columns) - set(range(len(contexts))):
+            raise ValueError("The links must belong to one of the contexts")
+        # NOTE: Taxonomy ids of the nodes in all the contexts are resolved in one query
+        Lineage.resolve_taxids(
+            Lineage.from_str(n["lineage"]) for n in all_node_dict.values()
+        )
         networks: List[Network] = []
-        for cid in range(n_networks):
-            metadata = data_dict[cid]["metadata"]
-            nodes = data_dict[cid]["nodes"]
-            links = data_dict[cid]["links"]
-            network_data = {**metadata, "nodes": nodes, "links": links}
-            networks.append(Network.load_json(raw_data=network_data))
+        for cid, context in enumerate(contexts):
+            sources, targets, weights, pvalues = link_columns.pop(cid, ([], [], [], []))
+            # NOTE: The nodes of a context are the linked nodes in the order they appear
+            linked_ids = pd.unique(np.array([sources, targets], dtype=object).T.ravel())
+            nodes = [all_node_dict[node_id] for node_id in linked_ids]
+            network_data = {**context, "nodes": nodes}
+            networks.append(
+                Network._from_json_data(
+                    network_data,
+                    sources,
+                    targets,
+                    np.array(weights, dtype=float),
+                    np.array(pvalues, dtype=float),
+                )
+            )
+        return cls(networks, id_field=id_field)
+
+    @classmethod
+    def load_binary(cls, fpath: str, id_field: str = "taxid") -> "NetworkGroup":
+        """
+        Create a `NetworkGroup` object from a network file in the binary (`npz`) format
+
+        Parameters
+        ----------
+        fpath : str
+            The path to the network `npz` file
+        id_field : str
+            The field to use while combining nodes
+            Default value is "taxid"
+
+        Returns
+        -------
+        NetworkGroup
+            The instance of the `NetworkGroup` class
+        """
+        bundles: Dict[int, Dict[str, np.ndarray]] = defaultdict(dict)
+        with np.load(fpath) as data:
+            for name in data.files:
+                cid, key = name.split("/", 1)
+                bundles[int(cid)][key] = data[name]
+        networks = [Network._from_bundle(bundles[cid]) for cid in range(len(bundles))]
+        return cls(networks, id_field=id_field)
+
+    @classmethod
+    def open(cls, path: str) -> "NetworkGroup":
+        """
+        Open a `NetworkGroup` from a directory written by `write_store`
+        Only the merged nodes and the mapping of the links to the edges are read
+        The network of a context is read from its file whenever it is accessed and
+        methods that take `cids` only read the networks of those contexts
+
+        Parameters
+        ----------
+        path : str
+            The path to the directory
+
+        Returns
+        -------
+        NetworkGroup
+            The instance of the `NetworkGroup` class
+        """
+        store = pathlib.Path(path)
+        with open(store / "group.json") as fid:
+            header = simplejson.load(fid)
+        arrays = {
+            name: np.load(store / f"{name}.npy", mmap_mode="r") for name in STORE_ARRAYS
+        }
+        group = cls.__new__(cls)
+        group.id_field = header["id_field"]
+        group._reset()
+        group._networks = _NetworkStore(
+            store / "contexts" / f"{cid}{BINARY_SUFFIX}"
+            for cid in range(len(header["contexts"]))
+        )
+        group._contexts = header["contexts"]
+        group._nodes = header["nodes"]
+        group._node_hash = {key: ind for ind, key in enumerate(header["node_keys"])}
+        group._node_maps = np.split(
+            arrays["node_maps"], arrays["node_map_offsets"][1:-1]
+        )
+        group._link_edges = np.split(
+            arrays["link_edges"], arrays["link_edge_offsets"][1:-1]
+        )
+        group._edge_keys = [arrays["edge_keys"]]
+        group._edge_hash = None
+        group._directed = header["directed"]
+        return group
+
+    @classmethod
+    def load_files(
+        cls, fpaths: List[str], id_field: str = "taxid", ncpus: int = 1
+    ) -> "NetworkGroup":
+        """
+        Create a `NetworkGroup` object from network files, one network per file
+        The files are parsed and validated in parallel using `Network.load`
+
+        Parameters
+        ----------
+        fpaths : List[str]
+            The paths to the network `JSON` or `npz` files
+        id_field : str
+            The field to use while combining nodes
+            Default value is "taxid"
+        ncpus : int
+            The number of processes used to load the files
+            Default value is 1
+
+        Returns
+        -------
+        NetworkGroup
+            The instance of the `NetworkGroup` class
+        """
+        fpaths = [str(fpath) for fpath in fpaths]
+        if ncpus > 1 and len(fpaths) > 1:
+            with mp.Pool(processes=min(ncpus, len(fpaths))) as pool:
+                networks = pool.map(Network.load, fpaths)
+        else:
+            networks = [Network.load(fpath) for fpath in fpaths]
         return cls(networks, id_field=id_field)
 
+    def _consensus_removal(
+        self, cids: List[int], method: str, parameters: List[float]
+    ) -> np.ndarray:
+        """
+        Returns the mask of the edges that are removed by the consensus for every parameter
+        The consensus score of every edge is computed only once for all the parameters
+
+        Parameters
+        ----------
+        cids : List[int]
+            The list of context ids that are to be used in the merger
+        method : str, {"simple_voting", "scaled_sum"}
+            The consensus method
+        parameters : List[float]
+            The parameters of the consensus method
+
+        Returns
+        -------
+        np.ndarray
+            The boolean array with one row per parameter and one column per edge
+            The edges are in the order of the rows of `get_sparse_adjacency_vectors`
+        """
+
+        # Method 1: Simple voting method
+        def simple_voting(
+            weights: np.ndarray, parameters: np.ndarray
+        ) -> Tuple[np.ndarray, np.ndarray]:
+            """Perform a simple voting consensus"""
+            size = weights.shape[1]  # no. of networks
+            num_req_edges = np.floor(parameters * size)
+            num_positive = (weights > 0).sum(axis=1)
+            num_negative = (weights < 0).sum(axis=1)
+            # NOTE: The most common sign is counted including the absent links (zeros)
+            num_zero = size - num_positive - num_negative
+            num_actual_edges = np.maximum.reduce([num_negative, num_zero, num_positive])
+            return num_actual_edges, num_req_edges
+
+        # Method 2: Scaled sum method
+        def scaled_sum(
+            weights: np.ndarray, parameters: np.ndarray
+        ) -> Tuple[np.ndarray, np.ndarray]:
+            """Peform a scaled sum consensus"""
+            size = weights.shape[1]  # no. of networks
+            with np.errstate(invalid="ignore"):
+                weights_scaled = weights / np.abs(weights).max(axis=0)
+            parameters_scaled = (size - 1) * parameters
+            return np.abs(np.nansum(weights_scaled, axis=1)), parameters_scaled
+
+        if method == "simple_voting":
+            consensus_method = simple_voting
+        elif method == "scaled_sum":
+            consensus_method = scaled_sum
+        else:
+            raise ValueError("Only methods supported are simple_voting and scaled_sum")
+        adj_vectors, _ = self.get_sparse_adjacency_vectors("weight", cids)
+        weights = adj_vectors.toarray()
+        # Filling with dummy values
+        weights[np.isnan(weights)] = 0.0  # dummy weights = 0
+        if len(weights) == 0:
+            return np.zeros((len(parameters), 0), dtype=bool)
+        scores, cutoffs = consensus_method(weights, np.asarray(parameters, dtype=float))
+        return scores[np.newaxis, :] < cutoffs[:, np.newaxis]
+
+    def _select_edges(self, cids: List[int], edge_mask: np.ndarray) -> "NetworkGroup":
+        """Create a `NetworkGroup` from the links of the `cids` that belong to selected edges"""
+        new_networks = [
+            self._networks[cid]._select_links(edge_mask[self._context_edges(cid)])
+            for cid in cids
+        ]
+        return NetworkGroup(new_networks, id_field=self.id_field)
+
     def get_consensus_network(
         self,
         cids: Optional[List[int]] = None,
@@ -502,72 +1232,91 @@ class NetworkGroup(Collection):
         consensus_network
             The `NetworkGroup` that represents the consensus network
         """
-
-        # Method 1: Simple voting method
-        def simple_voting(weights: pd.DataFrame, parameter: float) -> List[str]:
-            """Perform a simple voting consensus"""
-            size = weights.shape[1]  # no. of networks
-            num_req_edges = np.floor(parameter * size)
-            weights_signed = weights.copy()
-            weights_signed[weights_signed > 0] = 1
-            weights_signed[weights_signed < 0] = -1
-            weights_signed.astype(int, copy=False)
-            num_actual_edges = weights_signed.apply(
-                lambda row: Counter(row).most_common(1)[0][-1], axis=1
-            )
-            indices_removal = weights.index[num_actual_edges < num_req_edges]
-            return list(indices_removal)
-
-        # Method 2: Scaled sum method
-        def scaled_sum(weights: pd.DataFrame, parameter: float) -> List[str]:
-            """Peform a scaled sum consensus"""
-            size = weights.shape[1]  # no. of networks
-            weights_scaled = weights.apply(lambda x: x / (np.abs(x).max()))
-            parameter_scaled = (size - 1) * parameter
-            indices_removal = weights.index[
-                np.abs(weights_scaled.sum(axis=1)) < parameter_scaled
-            ]
-            return list(indices_removal)
-
-        # Step1: Filter by "cids" and make copies of graphs
-        graphs = []
+        # Step1: Filter by "cids"
         if not cids:
             cids = list(range(len(self.contexts)))
-        for cid, network in enumerate(self._networks):
-            if cid in cids:
-                graphs.append(network.graph.copy())
-        weights: pd.DataFrame = self.get_adjacency_vectors("weight")[cids]
-        # Filling with dummy values
-        weights.fillna(0.0, inplace=True)  # dummy weights = 0
 
         # Step 2: Apply voting method to each multiedge
-        # indices_removal has {new_id_source}-{new_id_target}
-        if method == "simple_voting":
-            indices_removal = simple_voting(weights, parameter)
-        elif method == "scaled_sum":
-            indices_removal = scaled_sum(weights, parameter)
-        else:
-            raise ValueError("Only methods supported are simple_voting and scaled_sum")
+        removal = self._consensus_removal(cids, method, [parameter])[0]
 
-        # Step 3: Use indices_removal on the networks
-        graph_dict = dict(enumerate(graphs))
-        for ind in indices_removal:
-            for cid, ind_old in self.linkid_revmap[ind]:
-                source_old, target_old = ind_old.split("-")
-                graph_dict[cid].remove_edge(source_old, target_old)
-        new_networks = [Network.load_graph(graph) for graph in graph_dict.values()]
+        # Step 3: Remove the links of the removed node pairs and return the NetworkGroup
+        return self._select_edges(cids, ~removal)
 
-        # Step 4: Return NetworkGroup object
-        return NetworkGroup(new_networks, id_field=self.id_field)
+    def consensus_sweep(
+        self,
+        method: str,
+        parameters: List[float],
+        cids: Optional[List[int]] = None,
+        fpath: Optional[str] = None,
+    ) -> Tuple[np.ndarray, pd.DataFrame]:
+        """
+        Get the consensus networks for a range of parameters in a single pass
+        The result for every parameter is identical to `get_consensus_network`
+
+        Parameters
+        ----------
+        method : str, {"simple_voting", "scaled_sum"}
+            The consensus method
+        parameters : List[float]
+            The parameters of the consensus method
+        cids : Optional[List[int]]
+            The list of context ids that are to be used in the merger
+            Default is None
+        fpath : str, optional
+            The path used to write the consensus networks of every parameter
+            The file name of every network is prefixed by its parameter
+            Default value is None which does not write the networks
+
+        Returns
+        -------
+        Tuple[np.ndarray, pd.DataFrame]
+            The mask of the edges that are kept for every parameter and the summary table
+            The edges are in the order of the rows of `get_sparse_adjacency_vectors`
+            The summary contains the number of edges and nodes that are kept and the
+            fraction of the links of every context that are kept ('agreement_{cid}')
+        """
+        if not cids:
+            cids = list(range(len(self.contexts)))
+        removal = self._consensus_removal(cids, method, parameters)
+        link_table, edges = self._link_table, self._edges
+        in_cids = np.isin(link_table["context"].values, cids)
+        present = np.zeros(len(edges), dtype=bool)
+        present[link_table["edge"].values[in_cids]] = True
+        edge_masks = present & ~removal
+        sources, targets = edges["source"].values, edges["target"].values
+        summary: Dict[str, Any] = {
+            "edges": edge_masks.sum(axis=1),
+            "nodes": [
+                len(np.union1d(sources[edge_mask], targets[edge_mask]))
+                for edge_mask in edge_masks
+            ],
+        }
+        for cid in cids:
+            context_edges = self._context_edges(cid)
+            if len(context_edges) == 0:
+                summary[f"agreement_{cid}"] = np.nan
+            else:
+                summary[f"agreement_{cid}"] = edge_masks[:, context_edges].mean(axis=1)
+        summary_df = pd.DataFrame(summary, index=pd.Index(parameters, name="parameter"))
+        if fpath is not None:
+            path = pathlib.Path(fpath)
+            for parameter, edge_mask in zip(parameters, edge_masks):
+                fname = f"{path.parent}/{parameter}_{path.stem}{path.suffix}"
+                self._select_edges(cids, edge_mask).write(fname)
+        return edge_masks, summary_df
 
-    def combine_pvalues(self, cids: List[int]) -> "NetworkGroup":
+    def combine_pvalues(self, cids: List[int], method: str = "brown") -> "NetworkGroup":
         """
-        Combine pvalues of links in the `cids` using Brown's p-value merging method
+        Combine pvalues of links in the `cids` using Brown's, Fisher's or Stouffer's method
+        The pvalues of links that are absent from a context are not combined
 
         Parameters:
         -----------
         cids : List[int]
             The list of context ids that are to be used in the merger
+        method : str, {"brown", "fisher", "stouffer"}
+            The p-value merging method
+            Default value is brown
 
         Returns
         -------
@@ -575,53 +1324,94 @@ class NetworkGroup(Collection):
             The `NetworkGroup` that contains the merged pvalues
         """
 
+        # Method 1: Brown's method
+        def brown(
+            weights: np.ndarray, pvalues: np.ndarray, present: np.ndarray
+        ) -> np.ndarray:
+            """Perform Brown's p-value merging"""
+            # E[psi] = 2 * k
+            k = pvalues.shape[1]
+            expected_value = 2 * k
+            # Var[psi] = 4*k + 2 * sum{i<j} (3.263 * corr_ij + 0.710 * corr_ij^2 + 0.027 * corr_ij^3)
+            # NOTE: The correlations are over the adjacency vectors of all the pairs of nodes
+            # and are calculated from the sums since the absent pairs have zero weights
+            size = len(self._nodes) ** 2
+            sums = weights.sum(axis=0)
+            cov = size * (weights.T @ weights) - np.outer(sums, sums)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                corr = cov / np.sqrt(np.outer(np.diag(cov), np.diag(cov)))
+            corr_upper = corr[np.triu_indices(k, 1)]
+            cov_approx = (
+                3.263 * corr_upper
+                + 0.710 * (corr_upper**2)
+                + 0.027 * (corr_upper**3)
+            )
+            variance = 4 * k + 2 * cov_approx.sum()
+            # df = 2 * E[psi]^2 / var[psi]
+            degrees_of_freedom = 2 * (expected_value**2) / variance
+            # c = var[psi] / (2 * E[psi])
+            correction_factor = variance / (2 * expected_value)
+            # NOTE: The absent links have dummy pvalues of 1 which do not change the sum
+            chi_square = -2.0 * np.log(pvalues).sum(axis=1) / correction_factor
+            return chi2.sf(chi_square, df=degrees_of_freedom)
+
+        # Method 2: Fisher's method
+        def fisher(
+            weights: np.ndarray, pvalues: np.ndarray, present: np.ndarray
+        ) -> np.ndarray:
+            """Perform Fisher's p-value merging"""
+            chi_square = -2.0 * np.where(present, np.log(pvalues), 0.0).sum(axis=1)
+            return chi2.sf(chi_square, df=2 * present.sum(axis=1))
+
+        # Method 3: Stouffer's method
+        def stouffer(
+            weights: np.ndarray, pvalues: np.ndarray, present: np.ndarray
+        ) -> np.ndarray:
+            """Perform Stouffer's p-value merging"""
+            eps = np.finfo(float).eps
+            zscores = norm.isf(np.clip(pvalues, eps, 1.0 - eps))
+            zscore = np.where(present, zscores, 0.0).sum(axis=1)
+            return norm.sf(zscore / np.sqrt(present.sum(axis=1)))
+
+        if method == "brown":
+            merging_method = brown
+        elif method == "fisher":
+            merging_method = fisher
+        elif method == "stouffer":
+            merging_method = stouffer
+        else:
+            raise ValueError("Only methods supported are brown, fisher and stouffer")
+
         # Step 1: Obtain the pvalues and weights
-        weight_df: pd.DataFrame = self.get_adjacency_vectors("weight")[cids]
-        pvalue_df: pd.DataFrame = self.get_adjacency_vectors("pvalue")[cids]
+        weight_vectors, _ = self.get_sparse_adjacency_vectors("weight", cids)
+        pvalue_vectors, _ = self.get_sparse_adjacency_vectors("pvalue", cids)
+        weights = weight_vectors.toarray()
+        pvalues = pvalue_vectors.toarray()
+        present = np.zeros(pvalues.shape, dtype=bool)
+        for ind, cid in enumerate(cids):
+            present[self._context_edges(cid), ind] = True
 
         # Filling with dummy values
-        weight_df.fillna(0.0, inplace=True)  # dummy weights = 0
-        pvalue_df.fillna(1.0, inplace=True)  # dummy pvalues = 1
+        weights[np.isnan(weights)] = 0.0  # dummy weights = 0
+        pvalues[np.isnan(pvalues) | ~present] = 1.0  # dummy pvalues = 1
         eps = np.finfo(float).eps
-        pvalue_df.replace(0.0, eps, inplace=True)  # to prevent log(0)
-
-        # Step 2: Calculate the combined pvalues using Browns method
-        # E[psi] = 2 * k
-        k = pvalue_df.shape[1]
-        expected_value = 2 * k
-        # Var[psi] = 4*k + 2 * sum{i<j} (3.263 * corr_ij + 0.710 * corr_ij^2 + 0.027 * corr_ij^3)
-        variance = 4 * k
-        for i in range(1, k):
-            for j in range(i - 1):
-                x_i = weight_df.iloc[:, i].values
-                x_j = weight_df.iloc[:, j].values
-                corr_ij, _ = pearsonr(x_i, x_j)
-                cov_ij_approx = (
-                    3.263 * corr_ij + 0.710 * (corr_ij**2) + 0.027 * (corr_ij**3)
-                )
-                variance += 2 * cov_ij_approx
-        # df = 2 * E[psi]^2 / var[psi]
-        degrees_of_freedom = 2 * (expected_value**2) / variance
-        # c = var[psi] / (2 * E[psi])
-        correction_factor = variance / (2 * expected_value)
-        link_ids = pvalue_df.index
-        chi_square = pvalue_df.apply(
-            lambda x: -2.0 * np.log(x).sum() / correction_factor, axis=1
-        )
-        pvalues_combined = pd.Series(
-            data=chi2.sf(chi_square, df=degrees_of_freedom), index=link_ids
-        )
+        pvalues[pvalues == 0.0] = eps  # to prevent log(0)
+
+        # Step 2: Calculate the combined pvalues of the edges
+        if len(pvalues) == 0:
+            pvalues_combined = np.zeros(0, dtype=float)
+        else:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                pvalues_combined = merging_method(weights, pvalues, present)
+            # NOTE: Edges that are absent from all the `cids` have no evidence to combine
+            pvalues_combined[~present.any(axis=1)] = 1.0
 
         # Step 3: Create new networks
-        graphs = [network.graph.copy() for network in self._networks]
-        graph_dict = dict(enumerate(graphs))
-        for ind in pvalues_combined.index:
-            for cid, ind_old in self.linkid_revmap[ind]:
-                source_old, target_old = ind_old.split("-")
-                graph_dict[cid].edges[source_old, target_old][
-                    "pvalue"
-                ] = pvalues_combined[ind]
-        new_networks = [Network.load_graph(graph) for graph in graphs]
+        new_networks = []
+        for cid, network in enumerate(self._networks):
+            mask = np.ones(len(network.sources), dtype=bool)
+            pvalues_new = pvalues_combined[self._context_edges(cid)]
+            new_networks.append(network._select_links(mask, pvalues=pvalues_new))
 
         # Step 4: Return NetworkGroup object
         return NetworkGroup(new_networks, id_field=self.id_field)
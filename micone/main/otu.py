@@ -12,6 +12,7 @@ from biom import Table
 from biom.util import biom_open
 
 from ..validation import BiomType, ObsmetaType, OtuValidator, SamplemetaType
+from . import lineage_table
 from .lineage import Lineage
 
 Filterfun = Callable[[np.ndarray, str, dict], bool]
@@ -372,7 +373,11 @@ class Otu:
         obs_metadata_copy = self.obs_metadata.drop(unwanted_obs_metadata_cols, axis=1)
         if level not in Lineage._fields:
             raise ValueError(f"level must be one of {Lineage._fields}")
-        cfunc = lambda id_ind, md: str(Lineage(**md).get_superset(level))
+        taxa = lineage_table.normalize(obs_metadata_copy)
+        superset = lineage_table.get_superset(taxa, level)
+        superset_strs = lineage_table.to_strs(superset)
+        superset_map = superset_strs.to_dict()
+        cfunc = lambda id_ind, md: superset_map[id_ind]
         otu_collapse = otu_data_copy.collapse(
             cfunc, axis="observation", norm=False, include_collapsed_metadata=True
         )
@@ -383,13 +388,8 @@ class Otu:
             raise ValueError("No metadata found in collapsed table")
         children_groups = dict(zip(curr_ids, children_group_list))
         otu_collapse.del_metadata(axis="observation")
-        afunc = lambda x: pd.Series(
-            Lineage(**x.to_dict()).get_superset(level).to_dict(level)
-        )
-        obs_collapse = obs_metadata_copy.apply(afunc, axis=1)
-        gfunc = lambda x: str(Lineage(**x.to_dict()))
-        obs_collapse.index = obs_collapse.apply(gfunc, axis=1)  # type: ignore
-        obs_collapse.drop_duplicates(inplace=True)
+        obs_collapse = superset.loc[:, :level].set_index(superset_strs.values)
+        obs_collapse = obs_collapse[~obs_collapse.index.duplicated()]
         otu_collapse.add_metadata(
             obs_collapse.to_dict(orient="index"), axis="observation"
         )
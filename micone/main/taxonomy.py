@@ -0,0 +1,745 @@
+"""
+    Module that manages the taxonomy database used to resolve lineages into taxonomy ids
+"""
+
+import hashlib
+import os
+import pathlib
+import sqlite3
+import string
+import tarfile
+from contextlib import closing
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from warnings import warn
+
+import numpy as np
+import simplejson
+from ete3 import NCBITaxa
+from ete3.ncbi_taxonomy.ncbiquery import DEFAULT_TAXADB
+
+from ..logging import LOG
+
+
+class TaxonomyBackend:
+    """
+    Interface for the taxonomy databases used by `Lineage`
+    The method names and return values mirror those of `ete3.NCBITaxa`
+    """
+
+    @property
+    def version(self) -> Optional[str]:
+        """
+        The version of the taxonomy database
+        Results are cached on disk only for backends that report a version
+        """
+        return None
+
+    def get_name_translator(self, names: Iterable[str]) -> Dict[str, List[int]]:
+        """
+        Translate taxonomy names into their taxonomy ids
+
+        Parameters
+        ----------
+        names : Iterable[str]
+            The scientific names of the taxa
+
+        Returns
+        -------
+        Dict[str, List[int]]
+            Dictionary mapping the names that were found to their taxonomy ids
+        """
+        raise NotImplementedError
+
+    def get_lineage(self, taxid: int) -> List[int]:
+        """
+        Get the lineage of a taxonomy id
+
+        Parameters
+        ----------
+        taxid : int
+            A valid taxonomy id
+
+        Returns
+        -------
+        List[int]
+            The taxonomy ids of the lineage sorted from root to `taxid`
+        """
+        raise NotImplementedError
+
+    def get_lineage_translator(self, taxids: Iterable[int]) -> Dict[int, List[int]]:
+        """
+        Get the lineages of many taxonomy ids
+
+        Parameters
+        ----------
+        taxids : Iterable[int]
+            Valid taxonomy ids
+
+        Returns
+        -------
+        Dict[int, List[int]]
+            Dictionary mapping the taxonomy ids to their lineages sorted from the root
+        """
+        return {taxid: self.get_lineage(taxid) for taxid in taxids}
+
+    def get_taxid_translator(self, taxids: Iterable[int]) -> Dict[int, str]:
+        """
+        Translate taxonomy ids into their scientific names
+
+        Parameters
+        ----------
+        taxids : Iterable[int]
+            The taxonomy ids
+
+        Returns
+        -------
+        Dict[int, str]
+            Dictionary mapping the taxonomy ids that were found to their names
+        """
+        raise NotImplementedError
+
+    def get_rank(self, taxids: Iterable[int]) -> Dict[int, str]:
+        """
+        Get the ranks of the taxonomy ids
+
+        Parameters
+        ----------
+        taxids : Iterable[int]
+            The taxonomy ids
+
+        Returns
+        -------
+        Dict[int, str]
+            Dictionary mapping the taxonomy ids that were found to their ranks
+        """
+        raise NotImplementedError
+
+
+@lru_cache(maxsize=None)
+def _hash_file_head(path: str, size: int, mtime_ns: int) -> str:
+    """Hash of the first MiB of a file, cached for every size and modification time"""
+    with open(path, "rb") as fid:
+        return hashlib.blake2b(fid.read(2**20), digest_size=8).hexdigest()
+
+
+def _file_version(path: str) -> str:
+    """
+    The version of a database file derived from its contents
+    Copies of the same file have the same version regardless of their modification time
+    """
+    stat = os.stat(path)
+    return f"{stat.st_size}-{_hash_file_head(path, stat.st_size, stat.st_mtime_ns)}"
+
+
+class NCBITaxonomy(TaxonomyBackend):
+    """
+    Taxonomy backend that uses the local `ete3` NCBI taxonomy database
+
+    The database is opened on first use and re-opened if the process is forked
+
+    Parameters
+    ----------
+    dbfile : str, optional
+        The path to the `ete3` sqlite database
+        Default value is None which uses the `ete3` default location
+    """
+
+    def __init__(self, dbfile: Optional[str] = None) -> None:
+        self.dbfile = dbfile
+        self._ncbi: Optional[NCBITaxa] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        """The version of the taxonomy database derived from the database file"""
+        dbfile = self.dbfile or DEFAULT_TAXADB
+        if not os.path.exists(dbfile):
+            return None
+        return _file_version(dbfile)
+
+    @property
+    def ncbi(self) -> NCBITaxa:
+        """The `NCBITaxa` instance connected to the database"""
+        pid = os.getpid()
+        if self._ncbi is None or self._pid != pid:
+            self._ncbi = NCBITaxa(dbfile=self.dbfile)
+            self._pid = pid
+        return self._ncbi
+
+    def get_name_translator(self, names: Iterable[str]) -> Dict[str, List[int]]:
+        return self.ncbi.get_name_translator(list(names))
+
+    def get_lineage(self, taxid: int) -> List[int]:
+        return self.ncbi.get_lineage(taxid)
+
+    def get_taxid_translator(self, taxids: Iterable[int]) -> Dict[int, str]:
+        return self.ncbi.get_taxid_translator(list(taxids))
+
+    def get_rank(self, taxids: Iterable[int]) -> Dict[int, str]:
+        return self.ncbi.get_rank(list(taxids))
+
+
+class _ByteStrings:
+    """Sequence view of the byte strings stored in a concatenated buffer"""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray) -> None:
+        self.offsets = offsets
+        self.data = data
+
+    def __getitem__(self, ind: int) -> bytes:
+        return self.data[self.offsets[ind] : self.offsets[ind + 1]].tobytes()
+
+
+class TaxonomyIndex(TaxonomyBackend):
+    """
+    Compact taxonomy backend that stores the taxonomy tree as arrays indexed by taxid
+    The arrays are memory-mapped so that lookups do not need a database connection
+    and the index is shared between all the processes on a node
+
+    Use `TaxonomyIndex.from_ete3` or `TaxonomyIndex.from_taxdump` to build the index
+
+    Parameters
+    ----------
+    folder : str
+        The folder containing the index
+    """
+
+    _arrays = [
+        "parents",
+        "ranks",
+        "name_offsets",
+        "names",
+        "key_hashes",
+        "key_offsets",
+        "keys",
+        "key_taxids",
+        "key_synonyms",
+        "merged_old",
+        "merged_new",
+    ]
+    _metadata_file = "metadata.json"
+    _synonym_classes = {
+        "synonym",
+        "equivalent name",
+        "genbank equivalent name",
+        "anamorph",
+        "genbank synonym",
+        "genbank anamorph",
+        "teleomorph",
+    }
+    _ascii_lower = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+    def __init__(self, folder: str) -> None:
+        self.folder = pathlib.Path(folder)
+        with open(self.folder / self._metadata_file, "r") as fid:
+            metadata = simplejson.load(fid)
+        self._version: str = metadata["version"]
+        self.rank_names: List[str] = metadata["ranks"]
+        arrays = {
+            name: np.load(self.folder / f"{name}.npy", mmap_mode="r")
+            for name in self._arrays
+        }
+        self.parents = arrays["parents"]
+        self.ranks = arrays["ranks"]
+        self.names = _ByteStrings(arrays["name_offsets"], arrays["names"])
+        self.key_hashes = arrays["key_hashes"]
+        self.keys = _ByteStrings(arrays["key_offsets"], arrays["keys"])
+        self.key_taxids = arrays["key_taxids"]
+        self.key_synonyms = arrays["key_synonyms"]
+        self.merged_old = arrays["merged_old"]
+        self.merged_new = arrays["merged_new"]
+
+    @property
+    def version(self) -> Optional[str]:
+        """The version of the taxonomy database the index was built from"""
+        return self._version
+
+    @classmethod
+    def from_ete3(cls, folder: str, dbfile: Optional[str] = None) -> "TaxonomyIndex":
+        """
+        Build the index from the local `ete3` NCBI taxonomy database
+
+        Parameters
+        ----------
+        folder : str
+            The folder in which the index is stored
+        dbfile : str, optional
+            The path to the `ete3` sqlite database
+            Default value is None which uses the `ete3` default location
+
+        Returns
+        -------
+        TaxonomyIndex
+            The taxonomy index
+        """
+        dbfile = dbfile or DEFAULT_TAXADB
+        version = NCBITaxonomy(dbfile).version
+        if version is None:
+            raise FileNotFoundError(f"The taxonomy database {dbfile} does not exist")
+        uri = f"{pathlib.Path(dbfile).resolve().as_uri()}?mode=ro"
+        with closing(sqlite3.connect(uri, uri=True)) as db:
+            result = db.execute("SELECT taxid, parent, spname, rank FROM species")
+            # NOTE: The parent of the root is stored as an empty string
+            species = [
+                (taxid, parent if parent != "" else taxid, name, rank)
+                for taxid, parent, name, rank in result.fetchall()
+            ]
+            synonyms = db.execute("SELECT taxid, spname FROM synonym").fetchall()
+            merged = db.execute("SELECT taxid_old, taxid_new FROM merged").fetchall()
+        cls._build(folder, species, synonyms, merged, version)
+        return cls(folder)
+
+    @classmethod
+    def from_taxdump(cls, folder: str, taxdump_file: str) -> "TaxonomyIndex":
+        """
+        Build the index from an NCBI taxdump archive
+        The taxa are selected in the same way as the `ete3` database
+
+        Parameters
+        ----------
+        folder : str
+            The folder in which the index is stored
+        taxdump_file : str
+            The path to the 'taxdump.tar.gz' archive from the NCBI ftp server
+
+        Returns
+        -------
+        TaxonomyIndex
+            The taxonomy index
+        """
+
+        def read_dmp(tar: tarfile.TarFile, fname: str) -> Iterator[List[str]]:
+            fid = tar.extractfile(fname)
+            if fid is None:
+                raise ValueError(f"{fname} not found in {taxdump_file}")
+            for line in fid:
+                yield line.decode().rstrip("\t|\n").split("\t|\t")
+
+        version = f"taxdump-{_file_version(taxdump_file)}"
+        sci_names: Dict[int, str] = dict()
+        synonyms: Dict[Tuple[int, bytes], str] = dict()
+        with tarfile.open(taxdump_file, "r") as tar:
+            for fields in read_dmp(tar, "names.dmp"):
+                taxid, name, name_class = int(fields[0]), fields[1], fields[3].lower()
+                name = name.strip('"')
+                if name_class == "scientific name":
+                    sci_names[taxid] = name
+                elif name_class in cls._synonym_classes:
+                    synonyms.setdefault((taxid, cls._name_key(name)), name)
+            species = [
+                (int(f[0]), int(f[1]), sci_names[int(f[0])], f[2])
+                for f in read_dmp(tar, "nodes.dmp")
+            ]
+            merged = [(int(f[0]), int(f[1])) for f in read_dmp(tar, "merged.dmp")]
+        synonym_list = [(taxid, name) for (taxid, _), name in synonyms.items()]
+        cls._build(folder, species, synonym_list, merged, version)
+        return cls(folder)
+
+    @classmethod
+    def _build(
+        cls,
+        folder: str,
+        species: List[Tuple[int, int, str, str]],
+        synonyms: List[Tuple[int, str]],
+        merged: List[Tuple[int, int]],
+        version: str,
+    ) -> None:
+        """
+        Write the index arrays
+
+        Parameters
+        ----------
+        folder : str
+            The folder in which the index is stored
+        species : List[Tuple[int, int, str, str]]
+            The (taxid, parent, scientific name, rank) of every taxon
+        synonyms : List[Tuple[int, str]]
+            The (taxid, name) of the synonyms
+        merged : List[Tuple[int, int]]
+            The (old taxid, new taxid) of the merged taxids
+        version : str
+            The version of the taxonomy database
+        """
+        species = sorted(species)
+        taxids = np.array([s[0] for s in species], dtype=np.int64)
+        size = max([1, *taxids, *(m[0] for m in merged)]) + 1
+        parents = np.full(size, -1, dtype=np.int32)
+        parents[taxids] = [s[1] for s in species]
+        parents[1] = 1
+        rank_names = sorted({s[3] for s in species})
+        rank_codes = {rank: code for code, rank in enumerate(rank_names)}
+        ranks = np.full(size, -1, dtype=np.int16)
+        ranks[taxids] = [rank_codes[s[3]] for s in species]
+        names = [s[2].encode() for s in species]
+        name_lengths = np.zeros(size, dtype=np.int64)
+        name_lengths[taxids] = [len(name) for name in names]
+        name_offsets = np.zeros(size + 1, dtype=np.int64)
+        name_offsets[1:] = np.cumsum(name_lengths)
+        keys = [(cls._name_key(s[2]), 0, s[0]) for s in species]
+        keys += [(cls._name_key(n), 1, t) for t, n in synonyms]
+        keys = sorted((cls._hash(key), syn, taxid, key) for key, syn, taxid in keys)
+        key_offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        key_offsets[1:] = np.cumsum([len(key[3]) for key in keys])
+        merged = sorted(merged)
+        arrays = {
+            "parents": parents,
+            "ranks": ranks,
+            "name_offsets": name_offsets,
+            "names": np.frombuffer(b"".join(names), dtype=np.uint8),
+            "key_hashes": np.array([key[0] for key in keys], dtype=np.int64),
+            "key_offsets": key_offsets,
+            "keys": np.frombuffer(b"".join(key[3] for key in keys), dtype=np.uint8),
+            "key_taxids": np.array([key[2] for key in keys], dtype=np.int32),
+            "key_synonyms": np.array([key[1] for key in keys], dtype=np.bool_),
+            "merged_old": np.array([m[0] for m in merged], dtype=np.int32),
+            "merged_new": np.array([m[1] for m in merged], dtype=np.int32),
+        }
+        path = pathlib.Path(folder)
+        path.mkdir(parents=True, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(path / f"{name}.npy", array)
+        with open(path / cls._metadata_file, "w") as fid:
+            simplejson.dump({"version": version, "ranks": rank_names}, fid)
+
+    @classmethod
+    def _name_key(cls, name: str) -> bytes:
+        """The key of a name in the index, used both to build and to query the index"""
+        # NOTE: Names are matched case-insensitively for ascii letters like in `ete3`
+        return name.translate(cls._ascii_lower).encode()
+
+    @staticmethod
+    def _hash(key: bytes) -> int:
+        """Hash of a name that is stable across processes"""
+        digest = hashlib.blake2b(key, digest_size=8).digest()
+        return int.from_bytes(digest, "little", signed=True)
+
+    def _resolve(self, taxids: List[int]) -> np.ndarray:
+        """Translate merged taxids into their new taxids and unknown taxids into -1"""
+        taxids_array = np.array(taxids, dtype=np.int64).reshape(-1)
+        in_range = (taxids_array >= 0) & (taxids_array < len(self.ranks))
+        ranks = self.ranks[np.where(in_range, taxids_array, 0)]
+        resolved = np.where(in_range & (ranks >= 0), taxids_array, -1)
+        if len(self.merged_old):
+            ind = np.searchsorted(self.merged_old, taxids_array)
+            ind = np.minimum(ind, len(self.merged_old) - 1)
+            merged = (resolved < 0) & (self.merged_old[ind] == taxids_array)
+            resolved[merged] = self.merged_new[ind[merged]]
+        return resolved
+
+    def get_name_translator(self, names: Iterable[str]) -> Dict[str, List[int]]:
+        name2origname = {self._name_key(name): name for name in names}
+        keys = list(name2origname)
+        hashes = np.array([self._hash(key) for key in keys], dtype=np.int64)
+        starts = np.searchsorted(self.key_hashes, hashes, side="left")
+        ends = np.searchsorted(self.key_hashes, hashes, side="right")
+        name2id: Dict[str, List[int]] = dict()
+        for name, key, start, end in zip(name2origname.values(), keys, starts, ends):
+            found: Dict[bool, List[int]] = {False: [], True: []}
+            for ind in range(start, end):
+                if self.keys[ind] == key:
+                    synonym = bool(self.key_synonyms[ind])
+                    found[synonym].append(int(self.key_taxids[ind]))
+            # NOTE: Synonyms are only used if the name is not a scientific name
+            if found[False] or found[True]:
+                name2id[name] = found[False] or found[True]
+        return name2id
+
+    def get_lineage(self, taxid: int) -> List[int]:
+        return self.get_lineage_translator([taxid])[taxid]
+
+    def get_lineage_translator(self, taxids: Iterable[int]) -> Dict[int, List[int]]:
+        taxids = [int(taxid) for taxid in taxids]
+        current = self._resolve(taxids)
+        for taxid, new_taxid in zip(taxids, current):
+            if new_taxid < 0:
+                raise ValueError(f"{taxid} taxid not found")
+            if new_taxid != taxid:
+                warn(f"taxid {taxid} was translated into {new_taxid}")
+        # NOTE: All the lineages are walked up to the root together one level at a time
+        tracks = [current]
+        while (tracks[-1] != 1).any():
+            tracks.append(np.asarray(self.parents[tracks[-1]], dtype=np.int64))
+            if (tracks[-1] < 0).any():
+                raise ValueError(f"The taxonomy index {self.folder} is incomplete")
+        tracks_array = np.column_stack(tracks)
+        depths = np.argmax(tracks_array == 1, axis=1)
+        return {
+            taxid: track[depth::-1].tolist()
+            for taxid, track, depth in zip(taxids, tracks_array, depths)
+        }
+
+    def get_taxid_translator(self, taxids: Iterable[int]) -> Dict[int, str]:
+        taxids = [int(taxid) for taxid in taxids]
+        resolved = self._resolve(taxids)
+        return {
+            taxid: self.names[new_taxid].decode()
+            for taxid, new_taxid in zip(taxids, resolved.tolist())
+            if new_taxid >= 0
+        }
+
+    def get_rank(self, taxids: Iterable[int]) -> Dict[int, str]:
+        taxids = [int(taxid) for taxid in taxids]
+        resolved = self._resolve(taxids)
+        return {
+            taxid: self.rank_names[self.ranks[taxid]]
+            for taxid, new_taxid in zip(taxids, resolved.tolist())
+            if new_taxid == taxid
+        }
+
+
+class TaxidCache:
+    """
+    Persistent cache of lineage to taxonomy id lookups stored in a sqlite database
+    Entries are keyed by the version of the taxonomy database so that they are
+    invalidated when the taxonomy database is updated. The entries of other versions
+    are removed once, the first time the opened cache is used with a version
+
+    Parameters
+    ----------
+    folder : str
+        The folder in which the cache database is stored
+        The folder is created if it does not exist
+    timeout : float, optional
+        The number of seconds to wait for locks held by concurrent writers
+        Default value is 60.0
+    """
+
+    fname = "taxid_cache.sqlite"
+    _chunk_size = 500
+
+    def __init__(self, folder: str, timeout: float = 60.0) -> None:
+        self.path = pathlib.Path(folder) / self.fname
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._timeout = timeout
+        self._versions: Set[str] = set()
+        try:
+            with closing(self._connect()) as db, db:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS taxids "
+                    "(lineage TEXT, version TEXT, rank TEXT, taxid INT, "
+                    "PRIMARY KEY (lineage, version))"
+                )
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS lineages "
+                    "(taxid INT, version TEXT, taxa TEXT, PRIMARY KEY (taxid, version))"
+                )
+        except sqlite3.OperationalError as err:
+            self._warn(err)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=self._timeout)
+
+    def _warn(self, err: sqlite3.OperationalError) -> None:
+        """Log an error of the cache database, the lookups fall back to the backend"""
+        LOG.logger.warning(f"Unable to use the taxid cache {self.path}: {err}")
+
+    def _invalidate(self, version: str) -> None:
+        """Remove the entries of other database versions once for every version"""
+        if version in self._versions:
+            return
+        self._versions.add(version)
+        try:
+            with closing(self._connect()) as db, db:
+                for table in ["taxids", "lineages"]:
+                    db.execute(f"DELETE FROM {table} WHERE version != ?", (version,))
+        except sqlite3.OperationalError as err:
+            self._warn(err)
+
+    def _write(self, table: str, rows: List[tuple], version: str) -> None:
+        """Insert rows into `table`"""
+        self._invalidate(version)
+        placeholders = ",".join("?" * len(rows[0]))
+        try:
+            with closing(self._connect()) as db, db:
+                db.executemany(
+                    f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", rows
+                )
+        except sqlite3.OperationalError as err:
+            self._warn(err)
+
+    def get_taxids(
+        self, lineages: List[str], version: str
+    ) -> Dict[str, Tuple[str, int]]:
+        """
+        Get the cached taxonomy ids of lineages
+
+        Parameters
+        ----------
+        lineages : List[str]
+            The lineage strings in the 'gg' format
+        version : str
+            The version of the taxonomy database
+
+        Returns
+        -------
+        Dict[str, Tuple[str, int]]
+            Dictionary mapping the lineages that were found to (rank, taxid)
+        """
+        self._invalidate(version)
+        taxids: Dict[str, Tuple[str, int]] = dict()
+        try:
+            with closing(self._connect()) as db:
+                for start in range(0, len(lineages), self._chunk_size):
+                    chunk = lineages[start : start + self._chunk_size]
+                    query = ",".join("?" * len(chunk))
+                    result = db.execute(
+                        "SELECT lineage, rank, taxid FROM taxids "
+                        f"WHERE version = ? AND lineage IN ({query})",
+                        (version, *chunk),
+                    )
+                    for lineage, rank, taxid in result.fetchall():
+                        taxids[lineage] = (rank, taxid)
+        except sqlite3.OperationalError as err:
+            self._warn(err)
+        return taxids
+
+    def put_taxids(self, taxids: Dict[str, Tuple[str, int]], version: str) -> None:
+        """
+        Store the taxonomy ids of lineages
+
+        Parameters
+        ----------
+        taxids : Dict[str, Tuple[str, int]]
+            Dictionary mapping the lineage strings to (rank, taxid)
+        version : str
+            The version of the taxonomy database
+        """
+        if taxids:
+            rows = [(k, version, rank, int(t)) for k, (rank, t) in taxids.items()]
+            self._write("taxids", rows, version)
+
+    def get_lineages(self, taxids: List[int], version: str) -> Dict[int, List[str]]:
+        """
+        Get the cached lineages of taxonomy ids
+
+        Parameters
+        ----------
+        taxids : List[int]
+            The taxonomy ids
+        version : str
+            The version of the taxonomy database
+
+        Returns
+        -------
+        Dict[int, List[str]]
+            Dictionary mapping the taxonomy ids that were found to the taxa of their lineages
+        """
+        self._invalidate(version)
+        lineages: Dict[int, List[str]] = dict()
+        try:
+            with closing(self._connect()) as db:
+                for start in range(0, len(taxids), self._chunk_size):
+                    chunk = [
+                        int(taxid) for taxid in taxids[start : start + self._chunk_size]
+                    ]
+                    query = ",".join("?" * len(chunk))
+                    result = db.execute(
+                        "SELECT taxid, taxa FROM lineages "
+                        f"WHERE version = ? AND taxid IN ({query})",
+                        (version, *chunk),
+                    )
+                    for taxid, taxa in result.fetchall():
+                        lineages[taxid] = simplejson.loads(taxa)
+        except sqlite3.OperationalError as err:
+            self._warn(err)
+        return lineages
+
+    def put_lineages(self, lineages: Dict[int, List[str]], version: str) -> None:
+        """
+        Store the lineages of taxonomy ids
+
+        Parameters
+        ----------
+        lineages : Dict[int, List[str]]
+            Dictionary mapping the taxonomy ids to the taxa of their lineages
+        version : str
+            The version of the taxonomy database
+        """
+        if lineages:
+            rows = [(int(t), version, simplejson.dumps(v)) for t, v in lineages.items()]
+            self._write("lineages", rows, version)
+
+
+_TAXONOMY: Optional[TaxonomyBackend] = None
+_TAXONOMY_LOCK = Lock()
+
+
+def get_taxonomy() -> TaxonomyBackend:
+    """
+    Get the process-wide taxonomy backend
+    The default backend is created on first call. It is the `TaxonomyIndex` stored in
+    the folder given by the `MICONE_TAXONOMY_INDEX` environment variable if it is set
+    and the `NCBITaxonomy` backend otherwise
+
+    Returns
+    -------
+    TaxonomyBackend
+        The taxonomy backend shared by all `Lineage` instances
+    """
+    global _TAXONOMY
+    if _TAXONOMY is None:
+        with _TAXONOMY_LOCK:
+            if _TAXONOMY is None:
+                index_folder = os.environ.get("MICONE_TAXONOMY_INDEX")
+                if index_folder:
+                    _TAXONOMY = TaxonomyIndex(index_folder)
+                else:
+                    _TAXONOMY = NCBITaxonomy()
+    return _TAXONOMY
+
+
+def set_taxonomy(backend: Optional[TaxonomyBackend]) -> None:
+    """
+    Set the process-wide taxonomy backend
+
+    Parameters
+    ----------
+    backend : Optional[TaxonomyBackend]
+        The taxonomy backend to be shared by all `Lineage` instances
+        Pass None to reset to the default backend
+    """
+    global _TAXONOMY
+    with _TAXONOMY_LOCK:
+        _TAXONOMY = backend
+
+
+_TAXID_CACHE: Optional[TaxidCache] = None
+_TAXID_CACHE_SET = False
+
+
+def get_taxid_cache() -> Optional[TaxidCache]:
+    """
+    Get the persistent taxid cache
+    Unless `set_taxid_cache` was called the cache is stored in the folder given by
+    the `MICONE_TAXID_CACHE` environment variable and is disabled if it is not set
+
+    Returns
+    -------
+    Optional[TaxidCache]
+        The persistent taxid cache or None if caching is disabled
+    """
+    global _TAXID_CACHE, _TAXID_CACHE_SET
+    if not _TAXID_CACHE_SET:
+        with _TAXONOMY_LOCK:
+            folder = os.environ.get("MICONE_TAXID_CACHE")
+            _TAXID_CACHE = TaxidCache(folder) if folder else None
+            _TAXID_CACHE_SET = True
+    return _TAXID_CACHE
+
+
+def set_taxid_cache(folder: Optional[str]) -> None:
+    """
+    Set the folder used to store the persistent taxid cache
+
+    Parameters
+    ----------
+    folder : Optional[str]
+        The folder in which the cache database is stored
+        Pass None to disable the cache
+    """
+    global _TAXID_CACHE, _TAXID_CACHE_SET
+    with _TAXONOMY_LOCK:
+        _TAXID_CACHE = TaxidCache(folder) if folder else None
+        _TAXID_CACHE_SET = True
@@ -1,18 +1,15 @@
-include { resample } from './../bootstrap/resample.nf'
 include { pearson } from './pearson.nf'
-include { pvalues } from './../bootstrap/pvalue.nf'
 
 workflow pearson_workflow {
     take:
         // tuple val(meta), file(otu_file), file(obs_metadata), file(sample_metadata), file(children_map)
         input_channel
     main:
+        // NOTE: The bootstrap resamples and pvalues are computed in memory by pearson
         input_channel \
-            | resample \
-            | pearson \
-            | pvalues
+            | pearson
     emit:
-        // pearson and pvalues have publishDir
+        // pearson has publishDir
         // tuple val(meta), file(corr_file), file(pvalue_file), file(obs_metadata), file(sample_metadata), file(children_map)
-        pvalues.out
+        pearson.out
 }
@@ -8,9 +8,9 @@ process spearman {
         mode: 'copy',
         overwrite: true
     input:
-        tuple val(meta), file(otu_file), file(bootstrap_files), file(obsmeta_file), file(samplemeta_file), file(children_file)
+        tuple val(meta), file(otu_file), file(obsmeta_file), file(samplemeta_file), file(children_file)
     output:
-        tuple val(new_meta), file(otu_file), file('*_corr.tsv'), file('*_corr.boot'), file(obsmeta_file), file(samplemeta_file), file(children_file)
+        tuple val(new_meta), file('*_corr.tsv'), file('*_pval.tsv'), file(obsmeta_file), file(samplemeta_file), file(children_file)
     when:
         "spearman" in params.network_inference.correlation['selection']
     script:
@@ -20,5 +20,8 @@ process spearman {
         f = getHierarchy(task_process)
         directory = "${new_meta.denoise_cluster}-${new_meta.chimera_checking}-${new_meta.tax_assignment}-${new_meta.otu_processing}"
         ncpus = params.network_inference.correlation['spearman']['ncpus']
+        memory_budget = params.network_inference.correlation['spearman']['memory_budget']
+        bootstraps = params.network_inference.bootstrap['resample']['bootstraps']
+        seed = params.network_inference.bootstrap['resample']['seed']
         template 'network_inference/correlation/spearman.py'
 }
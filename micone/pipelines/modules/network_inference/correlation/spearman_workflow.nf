@@ -1,18 +1,15 @@
-include { resample } from './../bootstrap/resample.nf'
 include { spearman } from './spearman.nf'
-include { pvalues } from './../bootstrap/pvalue.nf'
 
 workflow spearman_workflow {
     take:
         // tuple val(meta), file(otu_file), file(obs_metadata), file(sample_metadata), file(children_map)
         input_channel
     main:
+        // NOTE: The bootstrap resamples and pvalues are computed in memory by spearman
         input_channel \
-            | resample \
-            | spearman \
-            | pvalues
+            | spearman
     emit:
-        // spearman and pvalues have publishDir
+        // spearman has publishDir
         // tuple val(meta), file(corr_file), file(pvalue_file), file(obs_metadata), file(sample_metadata), file(children_map)
-        pvalues.out
+        spearman.out
 }
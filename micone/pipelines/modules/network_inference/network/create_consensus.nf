@@ -17,5 +17,6 @@ process create_consensus {
         pvalue_filter = params.network_inference.network['create_consensus']['pvalue_filter']
         interaction_filter = params.network_inference.network['create_consensus']['interaction_filter']
         id_field = params.network_inference.network['create_consensus']['id_field']
+        ncpus = params.network_inference.network['create_consensus']['ncpus']
         template 'network_inference/network/create_consensus.py'
 }
@@ -12,6 +12,8 @@ process merge_pvalues {
     script:
         String task_process = "${task.process}"
         f = getHierarchy(task_process)
+        method = params.network_inference.network['merge_pvalues']['method']
         id_field = params.network_inference.network['merge_pvalues']['id_field']
+        ncpus = params.network_inference.network['merge_pvalues']['ncpus']
         template 'network_inference/network/merge_pvalues.py'
 }
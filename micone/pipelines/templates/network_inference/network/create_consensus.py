@@ -3,7 +3,7 @@
 import pathlib
 from typing import List
 
-from micone import Network, NetworkGroup
+from micone import NetworkGroup
 
 
 def main(
@@ -14,11 +14,11 @@ def main(
     pvalue_filter: bool,
     interaction_filter: bool,
     id_field: str,
+    ncpus: int,
 ) -> None:
-    networks: List[Network] = []
-    for network_file in network_files:
-        networks.append(Network.load_json(str(network_file)))
-    network_group = NetworkGroup(networks, id_field=id_field)
+    network_group = NetworkGroup.load_files(
+        network_files, id_field=id_field, ncpus=ncpus
+    )
     pathlib.Path("consensus/").mkdir(parents=True, exist_ok=True)
     cids = list(range(len(network_group.contexts)))
     filtered_network_group = network_group.filter(
@@ -37,7 +37,11 @@ if __name__ == "__main__":
     PVALUE_FILTER = True if "${pvalue_filter}" == "true" else False
     INTERACTION_FILTER = True if "${interaction_filter}" == "true" else False
     ID_FIELD = "${id_field}"
-    NETWORK_FILES = list(pathlib.Path().glob("*_network.json"))
+    NCPUS = int("${ncpus}")
+    NETWORK_FILES = [
+        *pathlib.Path().glob("*_network.json"),
+        *pathlib.Path().glob("*_network.npz"),
+    ]
     main(
         BASE_NAME,
         NETWORK_FILES,
@@ -46,4 +50,5 @@ if __name__ == "__main__":
         PVALUE_FILTER,
         INTERACTION_FILTER,
         ID_FIELD,
+        NCPUS,
     )
@@ -3,17 +3,22 @@
 import pathlib
 from typing import List
 
-from micone import Network, NetworkGroup
+from micone import NetworkGroup
 
 
-def main(base_name: str, network_files: List[pathlib.Path], id_field: str) -> None:
-    networks: List[Network] = []
-    for network_file in network_files:
-        networks.append(Network.load_json(str(network_file)))
-    network_group = NetworkGroup(networks, id_field=id_field)
+def main(
+    base_name: str,
+    network_files: List[pathlib.Path],
+    method: str,
+    id_field: str,
+    ncpus: int,
+) -> None:
+    network_group = NetworkGroup.load_files(
+        network_files, id_field=id_field, ncpus=ncpus
+    )
     pathlib.Path("merged/").mkdir(parents=True, exist_ok=True)
     cids = list(range(len(network_group.contexts)))
-    merged_network_group = network_group.combine_pvalues(cids)
+    merged_network_group = network_group.combine_pvalues(cids, method=method)
     merged_network_group.write(
         "merged/" + base_name + "_network.json", split_files=True
     )
@@ -21,6 +26,11 @@ def main(base_name: str, network_files: List[pathlib.Path], id_field: str) -> No
 
 if __name__ == "__main__":
     BASE_NAME = "merged"
+    METHOD = "${method}"
     ID_FIELD = "${id_field}"
-    NETWORK_FILES = list(pathlib.Path().glob("*_network.json"))
-    main(BASE_NAME, NETWORK_FILES, ID_FIELD)
+    NCPUS = int("${ncpus}")
+    NETWORK_FILES = [
+        *pathlib.Path().glob("*_network.json"),
+        *pathlib.Path().glob("*_network.npz"),
+    ]
+    main(BASE_NAME, NETWORK_FILES, METHOD, ID_FIELD, NCPUS)
@@ -10,14 +10,28 @@ import pandas as pd
 HEADERS = ["Kingdom", "Phylum", "Class", "Order", "Family", "Genus", "Species"]
 
 
-def tax_splitter(full_tax):
-    tax_list = [tax.strip().split("__")[-1] for tax in full_tax.Taxon.split(";")]
-    tax_list = [
-        t.replace("'", "").replace("=", "").replace("[", "").replace("]", "")
-        for t in tax_list
-    ]
-    tax_list.extend([""] * (len(HEADERS) - len(tax_list)))
-    return pd.Series(data=tax_list, index=HEADERS)
+def tax_splitter(taxon):
+    # NOTE: Missing taxonomy strings get an empty lineage instead of a factorize code of -1
+    codes, unique_taxon = pd.factorize(taxon.fillna(""))
+    taxa = pd.Series(unique_taxon).str.split(";", expand=True).fillna("")
+    if taxa.shape[1] > len(HEADERS):
+        raise ValueError(
+            f"Taxonomy strings cannot have more than {len(HEADERS)} levels"
+        )
+    taxa = taxa.apply(
+        lambda col: col.str.strip()
+        .str.split("__")
+        .str[-1]
+        .str.replace("'", "", regex=False)
+        .str.replace("=", "", regex=False)
+        .str.replace("[", "", regex=False)
+        .str.replace("]", "", regex=False)
+    )
+    taxa = taxa.reindex(columns=range(len(HEADERS)), fill_value="")
+    taxa.columns = HEADERS
+    obs_metadata = taxa.take(codes)
+    obs_metadata.index = taxon.index
+    return obs_metadata
 
 
 def main(otu_table_file, tax_assignment_file, sample_metadata_file):
@@ -27,7 +41,7 @@ def main(otu_table_file, tax_assignment_file, sample_metadata_file):
     else:
         sample_metadata = pd.read_table(sample_metadata_file, index_col=0, comment="#")
     tax_assignment = pd.read_table(tax_assignment_file, index_col=0)
-    obs_metadata = tax_assignment[["Taxon"]].apply(tax_splitter, axis=1)
+    obs_metadata = tax_splitter(tax_assignment["Taxon"])
     for index in otu_table.ids("observation"):
         if index not in obs_metadata.index:
             obs_metadata.loc[index] = [""] * len(HEADERS)
@@ -12,12 +12,46 @@ import simplejson
 import toml
 
 from micone.main import Lineage
+from micone.main.taxonomy import TaxonomyBackend, set_taxonomy
 from micone.logging import LOG
 
 LOG.enable()
 print(f"Log file is at {LOG.path}")
 
 
+class DictTaxonomy(TaxonomyBackend):
+    """ Taxonomy backend backed by a small in-memory tree """
+
+    # taxid => (parent, name, rank)
+    tree = {
+        1: (1, "root", "no rank"),
+        2: (1, "Bacteria", "superkingdom"),
+        1239: (2, "Firmicutes", "phylum"),
+        186801: (1239, "Clostridia", "class"),
+    }
+
+    def __init__(self):
+        self.queries = 0
+
+    def get_name_translator(self, names):
+        self.queries += 1
+        name2id = {v[1]: k for k, v in self.tree.items()}
+        return {name: [name2id[name]] for name in names if name in name2id}
+
+    def get_lineage(self, taxid):
+        lineage = [taxid]
+        while taxid != 1:
+            taxid = self.tree[taxid][0]
+            lineage.append(taxid)
+        return list(reversed(lineage))
+
+    def get_taxid_translator(self, taxids):
+        return {t: self.tree[t][1] for t in taxids if t in self.tree}
+
+    def get_rank(self, taxids):
+        return {t: self.tree[t][2] for t in taxids if t in self.tree}
+
+
 BASEDIR = pathlib.Path.cwd()
 TEST_DATADIR = BASEDIR / "tests/data"
 SETTINGS_DIR = BASEDIR / "micone/config/configs"
@@ -312,3 +346,12 @@ def example_pipelines(example_pipeline_files):
         with open(pipeline_file) as fid:
             pipelines[key] = toml.load(fid)
     return pipelines
+
+
+@pytest.fixture
+def dict_taxonomy():
+    """ Fixture that installs the in-memory taxonomy backend """
+    backend = DictTaxonomy()
+    set_taxonomy(backend)
+    yield backend
+    set_taxonomy(None)
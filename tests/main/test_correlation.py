@@ -0,0 +1,112 @@
+"""
+    Module containing tests for the vectorized correlation methods
+"""
+
+import warnings
+
+import numpy as np
+import pytest
+from scipy.stats import pearsonr, spearmanr
+
+from micone.main import correlation
+
+
+def pairwise_correlation(data, corr_func):
+    """ Correlation matrix computed one pair of rows at a time """
+    n = data.shape[0]
+    corr_data = np.eye(n)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for i in range(n):
+            for j in range(i + 1, n):
+                corr_data[i, j] = corr_data[j, i] = corr_func(data[i], data[j])[0]
+    corr_data[np.isnan(corr_data)] = 0.0
+    return corr_data
+
+
+@pytest.fixture
+def abundances():
+    """ Fixture that returns a table of counts with constant and tied rows """
+    rng = np.random.default_rng(42)
+    data = rng.poisson(1.0, size=(20, 15)).astype(float)
+    data[2] = 0.0
+    data[5] = 0.1
+    data[8] = 2 * data[9]
+    return data
+
+
+class TestCorrelation:
+    """ Tests for the vectorized correlation methods """
+
+    @pytest.mark.parametrize(
+        "method,corr_func",
+        [(correlation.pearson, pearsonr), (correlation.spearman, spearmanr)],
+    )
+    def test_correlation(self, abundances, method, corr_func):
+        corr_data = method(abundances)
+        expected = pairwise_correlation(abundances, corr_func)
+        assert np.allclose(corr_data, expected, rtol=0, atol=1e-12)
+        assert (corr_data[2, np.arange(20) != 2] == 0.0).all()
+        assert corr_data[2, 2] == 1.0
+        stack = np.stack([abundances, abundances[:, ::-1], abundances[::-1]])
+        stack_corr = method(stack)
+        assert stack_corr.shape == (3, 20, 20)
+        for data, corr_data in zip(stack, stack_corr):
+            expected = pairwise_correlation(data, corr_func)
+            assert np.allclose(corr_data, expected, rtol=0, atol=1e-12)
+
+    @pytest.mark.parametrize("method", ["pearson", "spearman"])
+    def test_bootstrap_pvalues(self, abundances, method):
+        rng = np.random.default_rng(0)
+        abundances[0] = abundances[1] + rng.normal(0, 0.1, size=15)
+        corr_data, pval_data = correlation.bootstrap_pvalues(
+            abundances, method, bootstraps=99, seed=1, batch_size=10
+        )
+        assert np.array_equal(corr_data, correlation.METHODS[method](abundances))
+        assert pval_data.shape == (20, 20)
+        assert pval_data[0, 1] == pval_data[1, 0] == 0.01
+        assert (pval_data[2] == 1.0).all()
+        assert ((pval_data >= 0.01) & (pval_data <= 1.0)).all()
+        _, batch_pvals = correlation.bootstrap_pvalues(
+            abundances, method, bootstraps=99, seed=1, batch_size=7, ncpus=2
+        )
+        assert np.array_equal(pval_data, batch_pvals)
+        with pytest.raises(ValueError):
+            correlation.bootstrap_pvalues(abundances, "kendall")
+
+    def test_bootstrap_executor(self, abundances):
+        executor = correlation.BootstrapExecutor(ncpus=2, batch_size=10)
+        corr_data, pval_data = executor.bootstrap_pvalues(
+            abundances, "pearson", bootstraps=45, seed=3
+        )
+        assert len(executor.throughput) == 2
+        assert sum(stats["resamples"] for stats in executor.throughput) == 45
+        expected = correlation.bootstrap_pvalues(
+            abundances, "pearson", bootstraps=45, seed=3
+        )
+        assert np.array_equal(corr_data, expected[0])
+        assert np.array_equal(pval_data, expected[1])
+        with pytest.raises(ValueError):
+            correlation.BootstrapExecutor(ncpus=0)
+
+    def test_bootstrap_executor_memory_budget(self, abundances):
+        executor = correlation.BootstrapExecutor(ncpus=2, memory_budget=100000)
+        assert executor._get_batch_size(20, 15, 2) < executor._get_batch_size(20, 15)
+        corr_data, pval_data = executor.bootstrap_pvalues(
+            abundances, "spearman", bootstraps=45, seed=3
+        )
+        assert len(executor.throughput) == 2
+        assert sum(stats["resamples"] for stats in executor.throughput) == 45
+        expected = correlation.bootstrap_pvalues(
+            abundances, "spearman", bootstraps=45, seed=3
+        )
+        assert np.array_equal(corr_data, expected[0])
+        assert np.array_equal(pval_data, expected[1])
+        tiny = correlation.BootstrapExecutor(ncpus=2, memory_budget=1)
+        assert tiny._get_batch_size(20, 15, 2) == 1
+        assert np.array_equal(
+            tiny.bootstrap_pvalues(abundances, "spearman", bootstraps=45, seed=3)[1],
+            expected[1],
+        )
+        with pytest.raises(ValueError):
+            correlation.BootstrapExecutor(memory_budget=0)
@@ -52,6 +52,17 @@ class TestLineage:
         assert lineage1 == lineage2
         assert str(lineage1) == str(lineage2)
 
+    def test_from_str_interned(self, lineage_data):
+        lineage_str = str(Lineage(**lineage_data["good"]))
+        Lineage.from_str_cache_clear()
+        lineage1 = Lineage.from_str(lineage_str)
+        lineage2 = Lineage.from_str(lineage_str)
+        assert lineage1 is lineage2
+        assert Lineage.from_str(lineage_str, style="gg") is lineage1
+        cache_info = Lineage.from_str_cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 2
+
     def test_to_str(self, lineage_data):
         lineage1 = Lineage(**lineage_data["good"])
         assert (
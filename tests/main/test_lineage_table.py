@@ -0,0 +1,102 @@
+"""
+    Module containing tests for the vectorized lineage methods
+"""
+
+import pathlib
+import re
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import micone
+from micone.main import Lineage
+from micone.main import lineage_table
+
+
+LINEAGE_STRS = {
+    "gg": [
+        "k__Bacteria; p__Firmicutes; c__Clostridia; o__Clostridiales; f__; g__; s__",
+        "k__Bacteria;p__[Tenericutes];c__Mollicutes",
+        "p__Proteobacteria;c__Gammaproteobacteria;o__'Pasteurellales'",
+        "k__Bacteria; p__Firmicutes; c__Clostridia; o__Clostridiales; f__; g__; s__",
+        "k__Archaea",
+    ],
+    "silva": [
+        "D_0__Bacteria;D_1__Firmicutes;D_2__Bacilli;D_3__Lactobacillales",
+        "D_1__Bacteroidetes;D_2__Bacteroidia",
+        "D_0__Bacteria;D_1__A;D_2__B;D_3__C;D_4__D;D_5__E;D_6__F;D_7__G",
+    ],
+}
+
+
+ADD_MD2BIOM = (
+    pathlib.Path(micone.__file__).parent
+    / "pipelines/templates/tax_assignment/assign/add_md2biom.py"
+)
+
+
+def render_template(path):
+    """ Load a pipeline template after the escaping applied by Nextflow """
+    source = path.read_text()
+    # Nextflow templates are groovy strings where only the escapes below are valid
+    assert re.fullmatch(r"(?:[^\\]|\\[\\tn$\"'])*", source)
+    source = re.sub(r"\\(.)", lambda m: {"t": "\t", "n": "\n"}.get(m[1], m[1]), source)
+    module = types.ModuleType(path.stem)
+    exec(compile(source, str(path), "exec"), module.__dict__)
+    return module
+
+
+@pytest.mark.usefixtures("lineage_data")
+class TestLineageTable:
+    """ Tests for the vectorized lineage methods """
+
+    @pytest.mark.parametrize("style", ["gg", "silva"])
+    def test_from_strs(self, style):
+        lineage_strs = pd.Series(LINEAGE_STRS[style])
+        taxa = lineage_table.from_strs(lineage_strs, style)
+        expected = [Lineage.from_str(s, style) for s in lineage_strs]
+        assert [Lineage(*row) for row in taxa.itertuples(index=False)] == expected
+        with pytest.raises(ValueError):
+            lineage_table.from_strs(pd.Series(["c__Clostridia"]), style)
+
+    def test_normalize(self, lineage_data):
+        data = pd.DataFrame(
+            [
+                lineage_data["good"],
+                {**lineage_data["good"], "Genus": " [G2] ", "Species": ""},
+            ]
+        )
+        taxa = lineage_table.normalize(data)
+        expected = [Lineage(**row) for row in data.to_dict(orient="records")]
+        assert [Lineage(*row) for row in taxa.itertuples(index=False)] == expected
+        with pytest.warns(RuntimeWarning):
+            lineage_table.normalize(pd.DataFrame([lineage_data["bad"]]))
+
+    @pytest.mark.parametrize("level", list(Lineage._fields))
+    def test_superset_strs(self, level):
+        lineage_strs = pd.Series(LINEAGE_STRS["gg"])
+        taxa = lineage_table.from_strs(lineage_strs)
+        lineages = [Lineage.from_str(s) for s in lineage_strs]
+        superset = lineage_table.get_superset(taxa, level)
+        for style in ["gg", "silva"]:
+            assert list(lineage_table.to_strs(superset, style, level)) == [
+                l.get_superset(level).to_str(style, level) for l in lineages
+            ]
+        assert list(lineage_table.names(superset).itertuples(index=False)) == [
+            l.get_superset(level).name for l in lineages
+        ]
+
+    def test_tax_splitter(self):
+        add_md2biom = render_template(ADD_MD2BIOM)
+        taxon = pd.Series(
+            ["k__Bacteria;p__[Tenericutes];c__Mollicutes", np.nan, "k__Archaea"],
+            index=["otu1", "otu2", "otu3"],
+        )
+        obs_metadata = add_md2biom.tax_splitter(taxon)
+        assert list(obs_metadata.index) == list(taxon.index)
+        expected = ["Bacteria", "Tenericutes", "Mollicutes"] + [""] * 4
+        assert list(obs_metadata.loc["otu1"]) == expected
+        assert list(obs_metadata.loc["otu2"]) == [""] * 7
+        assert list(obs_metadata.loc["otu3"]) == ["Archaea"] + [""] * 6
@@ -5,10 +5,11 @@
 import json
 
 import networkx as nx
+import numpy as np
 import pandas as pd
 import pytest
 
-from micone.main import Network
+from micone.main import Network, NetworkGroup
 
 
 @pytest.mark.usefixtures("network_data", "correlation_files", "network_elist_files")
@@ -69,6 +70,25 @@ class TestNetwork:
             assert len(network.filter_links(True, True)) <= len(network.links)
             assert all(key in network.metadata for key in meta_data)
 
+    @pytest.mark.usefixtures("dict_taxonomy")
+    def test_load_data_prefilter(self, correlation_files):
+        for (
+            corr_file,
+            pval_file,
+            meta_file,
+            child_file,
+            obsmeta_file,
+            cmeta_file,
+        ) in correlation_files["good"]:
+            files = (corr_file, meta_file, cmeta_file, obsmeta_file, pval_file)
+            network = Network.load_data(*files, pvalue_correction=None)
+            network_prefilter = Network.load_data(
+                *files, pvalue_correction=None, prefilter=True
+            )
+            assert network_prefilter.nodes == network.nodes
+            assert network_prefilter.links == network._filter_links(False, True)
+            assert len(network_prefilter.links) < len(network.links)
+
     def test_graph(self, correlation_files):
         for (
             corr_file,
@@ -110,6 +130,64 @@ class TestNetwork:
             assert net_loaded_thres["nodes"] == network.nodes
             assert net_loaded_thres["links"] == network.filter_links(True, True)
 
+    @pytest.mark.usefixtures("dict_taxonomy")
+    def test_filter(self, correlation_files):
+        for (
+            corr_file,
+            pval_file,
+            meta_file,
+            child_file,
+            obsmeta_file,
+            cmeta_file,
+        ) in correlation_files["good"]:
+            network = Network.load_data(
+                corr_file, meta_file, cmeta_file, obsmeta_file, pval_file, child_file
+            )
+            mask = network.edge_mask(True, True)
+            assert mask.dtype == bool and len(mask) == len(network.links)
+            assert not mask.all()
+            weights = network.weights[mask]
+            assert (abs(weights) >= network.interaction_threshold).all()
+            network_filtered = network.filter(True, True)
+            assert network_filtered.node_table is network.node_table
+            assert network_filtered.links == network._filter_links(True, True)
+            assert network_filtered.metadata == network.metadata
+            network_group = NetworkGroup([network, network]).filter(True, True)
+            assert [len(n.links) for n in network_group] == [
+                len(network_filtered.links)
+            ] * 2
+
+    @pytest.mark.usefixtures("dict_taxonomy")
+    def test_adjacency_vectors(self, correlation_files):
+        for (
+            corr_file,
+            pval_file,
+            meta_file,
+            child_file,
+            obsmeta_file,
+            cmeta_file,
+        ) in correlation_files["good"]:
+            network = Network.load_data(
+                corr_file, meta_file, cmeta_file, obsmeta_file, pval_file, child_file
+            )
+            network_filtered = network.filter(False, True)
+            network_group = NetworkGroup([network, network_filtered], id_field="id")
+            adj_vectors, pairs = network_group.get_sparse_adjacency_vectors("weight")
+            assert adj_vectors.shape == (len(pairs), 2)
+            assert adj_vectors[:, 0].nnz == len(network.links)
+            assert adj_vectors[:, 1].nnz == len(network_filtered.links)
+            assert (pairs["source"] <= pairs["target"]).all()
+            adj_vector_df = network_group.get_adjacency_vectors("weight")
+            assert adj_vector_df.shape == (len(network_group.nodes) ** 2, 2)
+            assert (adj_vector_df != 0).sum().tolist() == [
+                len(network.links),
+                len(network_filtered.links),
+            ]
+            assert adj_vector_df.sum().round(8).tolist() == [
+                round(network.weights.sum(), 8),
+                round(network_filtered.weights.sum(), 8),
+            ]
+
     def test_write_load_network(self, correlation_files, tmpdir):
         for (
             corr_file,
@@ -131,6 +209,36 @@ class TestNetwork:
                 True, True
             )
 
+    @pytest.mark.usefixtures("dict_taxonomy")
+    def test_write_load_binary(self, correlation_files, tmpdir):
+        for (
+            corr_file,
+            pval_file,
+            meta_file,
+            child_file,
+            obsmeta_file,
+            cmeta_file,
+        ) in correlation_files["good"]:
+            network = Network.load_data(
+                corr_file, meta_file, cmeta_file, obsmeta_file, pval_file, child_file
+            )
+            folder = tmpdir.mkdir("test_write_load_binary")
+            network_file = str(folder.join("network.npz"))
+            network.write_binary(network_file)
+            network_loaded = Network.load(network_file)
+            assert network.metadata == network_loaded.metadata
+            assert network.nodes == network_loaded.nodes
+            assert network.links == network_loaded.links
+            network.write_binary(network_file, True, True)
+            network_loaded = Network.load(network_file)
+            assert network_loaded.links == network._filter_links(True, True)
+            network_group = NetworkGroup([network, network_loaded])
+            group_file = str(folder.join("group.npz"))
+            network_group.write(group_file)
+            group_loaded = NetworkGroup.load_binary(group_file)
+            assert group_loaded.nodes == network_group.nodes
+            assert group_loaded.links == network_group.links
+
     def test_load_elist(self, network_elist_files):
         for (
             network_file,
@@ -168,3 +276,86 @@ class TestNetwork:
                 for x in network_json.filter_links(True, True)
             }
             assert links1 == links2
+
+    @pytest.mark.usefixtures("dict_taxonomy")
+    def test_arrays(self):
+        metadata = {
+            "host": "human",
+            "condition": "healthy",
+            "location": "gut",
+            "experimental_metadata": {},
+            "publication": {"date": "2019-01-01", "authors": [], "pubmed_id": "1"},
+            "description": "test network",
+        }
+        obs_metadata = pd.DataFrame(
+            {
+                "Kingdom": ["Bacteria"] * 3,
+                "Phylum": ["Firmicutes"] * 3,
+                "Class": ["Clostridia", "", ""],
+            },
+            index=["otu1", "otu2", "otu3"],
+        )
+        links = [
+            ("otu1", "otu2", {"weight": 0.5, "pvalue": 0.01}),
+            ("otu2", "otu2", {"weight": 1.0, "pvalue": 0.0}),
+            ("otu3", "otu1", {"weight": 0.3, "pvalue": 0.04}),
+            ("otu2", "otu1", {"weight": -0.6, "pvalue": 0.02}),
+        ]
+        nodes = ["otu1", "otu2", "otu3", "otu2"]
+        network = Network(
+            nodes, links, metadata, {}, obs_metadata, pvalue_correction=None
+        )
+        assert list(network.node_ids) == ["otu1", "otu2", "otu3"]
+        assert network.node_table.loc["otu1", "taxlevel"] == "Class"
+        assert network.sources.dtype == np.int32
+        assert network.weights.dtype == np.float64
+        assert list(network.sources) == [1, 2]
+        assert list(network.targets) == [0, 0]
+        assert network.links == [
+            {"source": "otu2", "target": "otu1", "weight": -0.6, "pvalue": 0.02},
+            {"source": "otu3", "target": "otu1", "weight": 0.3, "pvalue": 0.04},
+        ]
+        assert network._graph is None
+        assert network.links == [d for *_, d in network.graph.edges(data=True)]
+        assert network.nodes == [d for _, d in network.graph.nodes(data=True)]
+        assert network.graph.graph is network.metadata
+        adj_table = network.get_adjacency_table("weight")
+        assert adj_table.loc["otu1", "otu2"] == adj_table.loc["otu2", "otu1"] == -0.6
+        adj_matrix, node_ids = network.get_adjacency_matrix("weight")
+        assert adj_matrix.nnz == 4
+        assert list(node_ids) == list(adj_table.index)
+        assert (adj_matrix.toarray() == adj_table.values).all()
+        invalid_links = [
+            ("otu1", "otu4", {"weight": 0.5, "pvalue": 0.01}),
+            ("otu1", "otu3", {"weight": np.inf, "pvalue": 0.01}),
+            ("otu1", "otu3", {"weight": np.nan, "pvalue": 0.01}),
+            ("otu1", "otu3", {"weight": 0.5, "pvalue": 1.5}),
+            ("otu1", "otu3", {"weight": 0.5, "pvalue": -0.1}),
+        ]
+        for source, target, data in invalid_links:
+            with pytest.raises(ValueError):
+                Network(nodes, [(source, target, data)], metadata, {}, obs_metadata)
+            with pytest.raises(ValueError):
+                Network.from_arrays(
+                    nodes,
+                    [source],
+                    [target],
+                    np.array([data["weight"]]),
+                    np.array([data["pvalue"]]),
+                    metadata,
+                    {},
+                    obs_metadata,
+                )
+        with pytest.raises(ValueError):
+            Network.from_arrays(
+                nodes,
+                ["otu1", "otu2"],
+                ["otu2"],
+                np.array([0.5]),
+                np.array([0.01]),
+                metadata,
+                {},
+                obs_metadata,
+            )
+        links = [("otu1", "otu3", {"weight": 0.5, "pvalue": np.nan})]
+        assert len(Network(nodes, links, metadata, {}, obs_metadata).links) == 1
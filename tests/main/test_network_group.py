@@ -0,0 +1,390 @@
+"""
+    Module containing tests for the NetworkGroup class
+"""
+
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from micone.main import Network, NetworkGroup
+from micone.main.network_group import _JSONStream
+
+
+@pytest.mark.usefixtures("correlation_files", "dict_taxonomy")
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+class TestNetworkGroup:
+    """ Tests for the NetworkGroup class """
+
+    def test_group_link_ids(self):
+        metadata = {
+            "host": "human",
+            "condition": "healthy",
+            "location": "gut",
+            "experimental_metadata": {},
+            "publication": {"date": "2019-01-01", "authors": [], "pubmed_id": "1"},
+            "description": "test network",
+        }
+        obs_metadata = pd.DataFrame(
+            {"Kingdom": ["Bacteria"] * 3, "Phylum": ["Firmicutes"] * 3},
+            index=["otu-1", "otu-2", "otu-3"],
+        )
+        nodes = ["otu-1", "otu-2", "otu-3"]
+        links1 = [
+            ("otu-1", "otu-2", {"weight": 0.5, "pvalue": 0.01}),
+            ("otu-3", "otu-1", {"weight": 0.3, "pvalue": 0.04}),
+        ]
+        links2 = [("otu-2", "otu-1", {"weight": 0.4, "pvalue": 0.02})]
+        networks = [
+            Network(nodes, links, metadata, {}, obs_metadata, pvalue_correction=None)
+            for links in [links1, links2]
+        ]
+        network_group = NetworkGroup(networks, id_field="id")
+        assert [node["id"] for node in network_group.nodes] == ["id0", "id1", "id2"]
+        adj_vectors, pairs = network_group.get_sparse_adjacency_vectors("weight")
+        assert adj_vectors.shape == (2, 2)
+        assert adj_vectors[:, 1].nnz == 1
+        assert network_group._graph is None
+        assert len(network_group.links) == 3
+        assert network_group.graph.graph["contexts"] is network_group.contexts
+        consensus = network_group.get_consensus_network(parameter=1.0)
+        assert consensus._graph is None
+        assert repr(consensus).endswith("nodes=3 links=2>")
+        for network in consensus:
+            assert [(l["source"], l["target"]) for l in network.links] in [
+                [("otu-1", "otu-2")],
+                [("otu-2", "otu-1")],
+            ]
+        merged = network_group.combine_pvalues([0, 1])
+        pvalues = [[l["pvalue"] for l in network.links] for network in merged]
+        assert len(pvalues[0]) == 2
+        assert pvalues[1][0] in pvalues[0]
+        for method in ["fisher", "stouffer"]:
+            merged = network_group.combine_pvalues([0, 1], method=method)
+            pvalues = {
+                (l["source"], l["target"]): l["pvalue"]
+                for network in merged
+                for l in network.links
+            }
+            assert pvalues[("otu-3", "otu-1")] == pytest.approx(0.04)
+            assert pvalues[("otu-2", "otu-1")] < 0.01
+        with pytest.raises(ValueError):
+            network_group.combine_pvalues([0, 1], method="mean")
+
+    def test_consensus_sweep(self, correlation_files, tmpdir):
+        for (
+            corr_file,
+            pval_file,
+            meta_file,
+            child_file,
+            obsmeta_file,
+            cmeta_file,
+        ) in correlation_files["good"]:
+            network = Network.load_data(
+                corr_file, meta_file, cmeta_file, obsmeta_file, pval_file, child_file
+            )
+            networks = [network, network.filter(False, True)]
+            networks.append(network.filter(True, True))
+            network_group = NetworkGroup(networks, id_field="id")
+            parameters = [0.0, 0.3, 0.6, 1.0]
+            for method in ["simple_voting", "scaled_sum"]:
+                fpath = f"{tmpdir}/{method}_network.json"
+                edge_masks, summary = network_group.consensus_sweep(
+                    method, parameters, fpath=fpath
+                )
+                assert edge_masks.shape == (len(parameters), len(network.links))
+                assert list(summary.index) == parameters
+                assert summary["agreement_0"].iloc[0] == 1.0
+                for parameter, edge_mask in zip(parameters, edge_masks):
+                    consensus = network_group.get_consensus_network(
+                        method=method, parameter=parameter
+                    )
+                    assert len(list(consensus)[0].links) == edge_mask.sum()
+                    assert summary.loc[parameter, "edges"] == edge_mask.sum()
+                    fname = f"{tmpdir}/{parameter}_{method}_network.json"
+                    with open(fname) as fid:
+                        assert fid.read() == consensus.json()
+            with pytest.raises(ValueError):
+                network_group.consensus_sweep("majority", parameters)
+
+    def test_group_extend(self, correlation_files):
+        for (
+            corr_file,
+            pval_file,
+            meta_file,
+            child_file,
+            obsmeta_file,
+            cmeta_file,
+        ) in correlation_files["good"]:
+            network = Network.load_data(
+                corr_file, meta_file, cmeta_file, obsmeta_file, pval_file, child_file
+            )
+            networks = [network, network.filter(False, True)]
+            networks.append(network.filter(True, True))
+            network_group = NetworkGroup(networks, id_field="id")
+            incremental_group = NetworkGroup(networks[:1], id_field="id")
+            assert incremental_group.nodes == network.nodes
+            incremental_group.add_network(networks[1])
+            incremental_group.extend(networks[2:])
+            first_group = NetworkGroup(networks[:1], id_field="id")
+            added_group = first_group + NetworkGroup(networks[1:], id_field="id")
+            assert len(first_group) == 1
+            assert first_group.nodes == network.nodes
+            adj_vectors, pairs = network_group.get_sparse_adjacency_vectors("pvalue")
+            for group in [incremental_group, added_group]:
+                assert len(group) == 3
+                assert group.nodes == network_group.nodes
+                assert group.links == network_group.links
+                group_vectors, group_pairs = group.get_sparse_adjacency_vectors(
+                    "pvalue"
+                )
+                assert group_pairs.equals(pairs)
+                assert (group_vectors != adj_vectors).nnz == 0
+            with pytest.raises(ValueError):
+                network_group.extend([network_group])
+
+    def test_group_extend_directed(self):
+        metadata = {
+            "host": "human",
+            "condition": "healthy",
+            "location": "gut",
+            "experimental_metadata": {},
+            "publication": {"date": "2019-01-01", "authors": [], "pubmed_id": "1"},
+            "description": "test network",
+        }
+        obs_metadata = pd.DataFrame(
+            {"Kingdom": ["Bacteria"] * 3, "Phylum": ["Firmicutes"] * 3},
+            index=["otu-1", "otu-2", "otu-3"],
+        )
+        nodes = ["otu-1", "otu-2", "otu-3"]
+        links = [
+            ("otu-2", "otu-1", {"weight": 0.5, "pvalue": 0.01}),
+            ("otu-3", "otu-1", {"weight": 0.3, "pvalue": 0.04}),
+        ]
+        networks = [
+            Network(
+                nodes,
+                links,
+                metadata,
+                {},
+                obs_metadata,
+                pvalue_correction=None,
+                directed=directed,
+            )
+            for directed in [False, True]
+        ]
+        network_group = NetworkGroup(networks, id_field="id")
+        for first, second in [networks, networks[::-1]]:
+            incremental_group = NetworkGroup([first], id_field="id")
+            incremental_group.add_network(second)
+            assert not incremental_group.graph.is_directed()
+        incremental_group = NetworkGroup(networks[:1], id_field="id")
+        incremental_group.add_network(networks[1])
+        assert incremental_group.links == network_group.links
+        assert incremental_group.json() == network_group.json()
+        consensus = incremental_group.get_consensus_network(parameter=1.0)
+        assert consensus.json() == network_group.get_consensus_network(
+            parameter=1.0
+        ).json()
+
+    def test_to_network(self, correlation_files):
+        for (
+            corr_file,
+            pval_file,
+            meta_file,
+            child_file,
+            obsmeta_file,
+            cmeta_file,
+        ) in correlation_files["good"]:
+            network = Network.load_data(
+                corr_file, meta_file, cmeta_file, obsmeta_file, pval_file, child_file
+            )
+            networks = [network, network.filter(False, True)]
+            network_group = NetworkGroup(networks, id_field="id")
+            weights, pairs = network_group.get_sparse_adjacency_vectors("weight")
+            pvalues, _ = network_group.get_sparse_adjacency_vectors("pvalue")
+            weights, pvalues = weights.toarray(), pvalues.toarray()
+            present = weights != 0
+            expected = {
+                "mean": weights.sum(axis=1) / present.sum(axis=1),
+                "weighted_mean": (weights @ [1.0, 3.0]) / (present @ [1.0, 3.0]),
+                "max_abs": weights[
+                    np.arange(len(weights)), np.abs(weights).argmax(axis=1)
+                ],
+                "min_pvalue": weights[
+                    np.arange(len(weights)),
+                    np.where(present, pvalues, np.inf).argmin(axis=1),
+                ],
+            }
+            ids = [node["id"] for node in network_group.nodes]
+            for method, expected_weights in expected.items():
+                flat_network = network_group.to_network(
+                    method, context_weights=[1.0, 3.0]
+                )
+                assert flat_network.metadata["interaction_type"] == "simple"
+                assert len(flat_network.links) == len(pairs)
+                flat_weights = {
+                    (link["source"], link["target"]): link["weight"]
+                    for link in flat_network.links
+                }
+                for source, target, weight in zip(
+                    pairs["source"], pairs["target"], expected_weights
+                ):
+                    assert flat_weights[(ids[source], ids[target])] == pytest.approx(
+                        weight
+                    )
+            median_network = NetworkGroup([network] * 3, id_field="id").to_network(
+                "median"
+            )
+            assert sorted(l["weight"] for l in median_network.links) == sorted(
+                l["weight"] for l in network.links
+            )
+            with pytest.raises(ValueError):
+                network_group.to_network("mode")
+            with pytest.raises(ValueError):
+                network_group.to_network("weighted_mean")
+
+    def test_to_network_no_links(self):
+        metadata = {
+            "host": "human",
+            "condition": "healthy",
+            "location": "gut",
+            "experimental_metadata": {},
+            "publication": {"date": "2019-01-01", "authors": [], "pubmed_id": "1"},
+            "description": "test network",
+        }
+        obs_metadata = pd.DataFrame(
+            {"Kingdom": ["Bacteria"] * 3, "Phylum": ["Firmicutes"] * 3},
+            index=["otu-1", "otu-2", "otu-3"],
+        )
+        nodes = ["otu-1", "otu-2", "otu-3"]
+        networks = [
+            Network(nodes, [], metadata, {}, obs_metadata, pvalue_correction=None)
+            for _ in range(2)
+        ]
+        network_group = NetworkGroup(networks, id_field="id")
+        for method in ["mean", "median", "max_abs", "min_pvalue", "weighted_mean"]:
+            flat_network = network_group.to_network(
+                method, context_weights=[1.0, 3.0]
+            )
+            assert flat_network.links == []
+            assert [node["id"] for node in flat_network.nodes] == [
+                node["id"] for node in network_group.nodes
+            ]
+
+    def test_group_store(self, correlation_files, tmpdir, monkeypatch):
+        for (
+            corr_file,
+            pval_file,
+            meta_file,
+            child_file,
+            obsmeta_file,
+            cmeta_file,
+        ) in correlation_files["good"]:
+            network = Network.load_data(
+                corr_file, meta_file, cmeta_file, obsmeta_file, pval_file, child_file
+            )
+            networks = [network, network.filter(False, True)]
+            networks.append(network.filter(True, True))
+            network_group = NetworkGroup(networks, id_field="id")
+            path = f"{tmpdir}/store"
+            NetworkGroup(networks[:2], id_field="id").write_store(path)
+            loads = []
+            load_binary = Network.load_binary
+
+            def count_loads(fpath):
+                loads.append(fpath)
+                return load_binary(fpath)
+
+            monkeypatch.setattr(Network, "load_binary", count_loads)
+            stored_group = NetworkGroup.open(path)
+            stored_group.add_network(networks[2])
+            stored_group.write_store(path)
+            assert len(loads) == 0
+            stored_group = NetworkGroup.open(path)
+            assert len(loads) == 0
+            assert len(stored_group) == 3
+            assert stored_group.nodes == network_group.nodes
+            assert stored_group.contexts == network_group.contexts
+            consensus = stored_group.get_consensus_network(cids=[1, 2])
+            assert len(loads) == 4
+            expected = network_group.get_consensus_network(cids=[1, 2])
+            assert consensus.json() == expected.json()
+            assert stored_group[1].json() == networks[1].json()
+            assert stored_group.json() == network_group.json()
+
+    def test_load_files(self, correlation_files, tmpdir):
+        for (
+            corr_file,
+            pval_file,
+            meta_file,
+            child_file,
+            obsmeta_file,
+            cmeta_file,
+        ) in correlation_files["good"]:
+            network = Network.load_data(
+                corr_file, meta_file, cmeta_file, obsmeta_file, pval_file, child_file
+            )
+            fpaths = [f"{tmpdir}/0_network.json", f"{tmpdir}/1_network.npz"]
+            network.write(fpaths[0])
+            network.filter(False, True).write_binary(fpaths[1])
+            network_group = NetworkGroup.load_files(fpaths, id_field="id")
+            parallel_group = NetworkGroup.load_files(fpaths, id_field="id", ncpus=2)
+            assert len(parallel_group) == 2
+            assert parallel_group.nodes == network_group.nodes
+            assert parallel_group.links == network_group.links
+            assert parallel_group.json() == network_group.json()
+
+    def test_json_stream(self):
+        data = {
+            "contexts": [{"a": 1.25, "b": [1, 2, {"c": None}]}],
+            "empty": [],
+            "links": [{"weight": 123456.789, "pvalue": 1e-10}] * 5,
+            "nodes": [],
+            "other": 12345678,
+        }
+        text = json.dumps(data, indent=2)
+        for chunk_size in [1, 3, 7, 1024]:
+            stream = _JSONStream(io.StringIO(text), chunk_size=chunk_size)
+            parsed = dict()
+            for key in stream.iter_object():
+                if key in {"links", "nodes", "empty"}:
+                    parsed[key] = list(stream.iter_array())
+                else:
+                    parsed[key] = stream.decode()
+            assert parsed == data
+        with pytest.raises(ValueError):
+            stream = _JSONStream(io.StringIO(text[:-10]), chunk_size=7)
+            for key in stream.iter_object():
+                stream.decode()
+
+    def test_group_write_load_json(self, correlation_files, tmpdir):
+        for (
+            corr_file,
+            pval_file,
+            meta_file,
+            child_file,
+            obsmeta_file,
+            cmeta_file,
+        ) in correlation_files["good"]:
+            network = Network.load_data(
+                corr_file, meta_file, cmeta_file, obsmeta_file, pval_file, child_file
+            )
+            networks = [network, network.filter(False, True)]
+            network_group = NetworkGroup(networks, id_field="id")
+            fpath = f"{tmpdir}/network_group.json"
+            network_group.write(fpath, pvalue_filter=True)
+            with open(fpath) as fid:
+                raw_data = json.load(fid)
+            assert raw_data == json.loads(network_group.json(pvalue_filter=True))
+            loaded_group = NetworkGroup.load_json(fpath, id_field="id")
+            raw_group = NetworkGroup.load_json(raw_data=raw_data, id_field="id")
+            assert loaded_group.json() == raw_group.json()
+            assert len(loaded_group) == 2
+            for loaded_network, network in zip(loaded_group, networks):
+                links = json.loads(network.json(pvalue_filter=True))["links"]
+                assert sorted(l["weight"] for l in loaded_network.links) == sorted(
+                    l["weight"] for l in links
+                )
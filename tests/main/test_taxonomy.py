@@ -0,0 +1,237 @@
+"""
+    Module containing tests for the taxonomy backends
+"""
+
+import io
+import os
+import tarfile
+
+import pytest
+from ete3 import NCBITaxa
+
+from micone.main import Lineage
+from micone.main import taxonomy
+from micone.main.taxonomy import (
+    NCBITaxonomy,
+    TaxidCache,
+    TaxonomyIndex,
+    get_taxonomy,
+    set_taxid_cache,
+    set_taxonomy,
+)
+
+from ..conftest import DictTaxonomy
+
+
+class VersionedDictTaxonomy(DictTaxonomy):
+    """ In-memory taxonomy backend that reports a database version """
+
+    def __init__(self, version):
+        super().__init__()
+        self._version = version
+
+    @property
+    def version(self):
+        return self._version
+
+    def get_lineage(self, taxid):
+        self.queries += 1
+        return super().get_lineage(taxid)
+
+
+@pytest.fixture
+def taxdump_file(tmp_path):
+    """ Fixture that writes a small NCBI taxdump archive """
+    nodes = [
+        (1, 1, "no rank"),
+        (131567, 1, "no rank"),
+        (2, 131567, "superkingdom"),
+        (2157, 131567, "superkingdom"),
+        (1239, 2, "phylum"),
+        (186801, 1239, "class"),
+        (186802, 186801, "order"),
+        (31979, 186802, "family"),
+        (1485, 31979, "genus"),
+        (1502, 1485, "species"),
+    ]
+    names = [
+        (1, "root", "scientific name"),
+        (131567, "cellular organisms", "scientific name"),
+        (2, "Bacteria", "scientific name"),
+        (2, "Monera", "synonym"),
+        (2157, "Archaea", "scientific name"),
+        (2157, "Clostridia", "synonym"),
+        (1239, "Firmicutes", "scientific name"),
+        (1239, "Bacillota", "synonym"),
+        (186801, "Clostridia", "scientific name"),
+        (186802, "Clostridiales", "scientific name"),
+        (31979, "Clostridiaceae", "scientific name"),
+        (1485, "Clostridium", "scientific name"),
+        (1485, "Clostridium Ångström", "synonym"),
+        (1502, "Clostridium perfringens", "scientific name"),
+    ]
+    dmp_files = {
+        "nodes.dmp": [(*node, "") for node in nodes],
+        "names.dmp": [(taxid, name, "", cls) for taxid, name, cls in names],
+        "merged.dmp": [(12345, 1239)],
+    }
+    path = tmp_path / "taxdump.tar.gz"
+    with tarfile.open(path, "w:gz") as tar:
+        for fname, rows in dmp_files.items():
+            data = "".join("\t|\t".join(map(str, r)) + "\t|\n" for r in rows).encode()
+            info = tarfile.TarInfo(fname)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return path
+
+
+class TestTaxonomy:
+    """ Tests for the taxonomy backends """
+
+    def test_lazy_backend(self):
+        set_taxonomy(None)
+        Lineage(Kingdom="Bacteria", Phylum="Firmicutes")
+        assert taxonomy._TAXONOMY is None
+
+    def test_shared_backend(self, dict_taxonomy):
+        assert get_taxonomy() is dict_taxonomy
+        lineage = Lineage(Kingdom="Bacteria", Phylum="Firmicutes", Class="Clostridia")
+        with pytest.warns(RuntimeWarning):
+            assert lineage.taxid == ("Class", 186801)
+        assert dict_taxonomy.queries == 1
+
+    def test_from_taxid(self, dict_taxonomy):
+        lineage = Lineage.from_taxid(186801)
+        assert lineage == Lineage(
+            Kingdom="Bacteria", Phylum="Firmicutes", Class="Clostridia"
+        )
+
+    def test_resolve_taxids(self, dict_taxonomy):
+        lineage1 = Lineage(Kingdom="Bacteria", Phylum="Firmicutes")
+        lineage2 = Lineage(Kingdom="Bacteria", Phylum="Firmicutes", Class="Clostridia")
+        lineage3 = Lineage(Kingdom="Bacteria", Phylum="Unknown")
+        with pytest.warns(RuntimeWarning):
+            taxids = Lineage.resolve_taxids([lineage1, lineage2, lineage1, lineage3])
+        assert taxids == [
+            ("Phylum", 1239),
+            ("Class", 186801),
+            ("Phylum", 1239),
+            ("Kingdom", 2),
+        ]
+        assert dict_taxonomy.queries == 1
+        assert lineage2.taxid == ("Class", 186801)
+        assert dict_taxonomy.queries == 1
+
+    def test_taxid_cache(self, tmp_path):
+        backend = VersionedDictTaxonomy("v1")
+        set_taxonomy(backend)
+        set_taxid_cache(str(tmp_path))
+        try:
+            lineage = Lineage(Kingdom="Bacteria", Phylum="Firmicutes")
+            assert lineage.taxid == ("Phylum", 1239)
+            assert Lineage.from_taxid(186801).Class == "Clostridia"
+            # A new backend instance resets the in-memory taxids but not the cache
+            backend = VersionedDictTaxonomy("v1")
+            set_taxonomy(backend)
+            assert lineage.taxid == ("Phylum", 1239)
+            assert Lineage.from_taxid(186801).Class == "Clostridia"
+            assert backend.queries == 0
+            # An updated database invalidates the cache
+            backend = VersionedDictTaxonomy("v2")
+            set_taxonomy(backend)
+            assert lineage.taxid == ("Phylum", 1239)
+            assert backend.queries == 1
+        finally:
+            set_taxid_cache(None)
+            set_taxonomy(None)
+
+    def test_taxid_cache_invalidation(self, tmp_path):
+        cache = TaxidCache(str(tmp_path))
+        cache.put_taxids({"k__Bacteria": ("Kingdom", 2)}, "v1")
+        cache.put_lineages({2: ["root", "Bacteria"]}, "v1")
+        # Entries of other versions are removed when a new version is first used
+        new_cache = TaxidCache(str(tmp_path))
+        new_cache.put_taxids({"k__Archaea": ("Kingdom", 2157)}, "v2")
+        assert cache.get_taxids(["k__Bacteria"], "v1") == {}
+        assert cache.get_lineages([2], "v1") == {}
+        # Writes do not remove the entries that other processes store afterwards
+        cache.put_taxids({"k__Bacteria": ("Kingdom", 2)}, "v1")
+        new_cache.put_taxids({"p__Firmicutes": ("Phylum", 1239)}, "v2")
+        assert cache.get_taxids(["k__Bacteria"], "v1") == {"k__Bacteria": ("Kingdom", 2)}
+        assert new_cache.get_taxids(["k__Archaea", "p__Firmicutes"], "v2") == {
+            "k__Archaea": ("Kingdom", 2157),
+            "p__Firmicutes": ("Phylum", 1239),
+        }
+
+    def test_taxid_cache_errors(self, tmp_path):
+        # The cache database cannot be opened when its path is a folder
+        (tmp_path / TaxidCache.fname).mkdir()
+        cache = TaxidCache(str(tmp_path))
+        cache.put_taxids({"k__Bacteria": ("Kingdom", 2)}, "v1")
+        assert cache.get_taxids(["k__Bacteria"], "v1") == {}
+        assert cache.get_lineages([2], "v1") == {}
+        backend = VersionedDictTaxonomy("v1")
+        set_taxonomy(backend)
+        set_taxid_cache(str(tmp_path))
+        try:
+            assert Lineage(Kingdom="Bacteria", Phylum="Firmicutes").taxid == (
+                "Phylum",
+                1239,
+            )
+            assert Lineage.from_taxid(186801).Class == "Clostridia"
+        finally:
+            set_taxid_cache(None)
+            set_taxonomy(None)
+
+    def test_database_version(self, tmp_path):
+        dbfiles = [tmp_path / "taxa1.sqlite", tmp_path / "taxa2.sqlite"]
+        for dbfile in dbfiles:
+            dbfile.write_bytes(b"taxonomy database")
+        os.utime(dbfiles[1], ns=(0, 0))
+        versions = [NCBITaxonomy(str(dbfile)).version for dbfile in dbfiles]
+        assert versions[0] == versions[1]
+        dbfiles[1].write_bytes(b"taxonomy Database")
+        assert NCBITaxonomy(str(dbfiles[1])).version != versions[0]
+        assert NCBITaxonomy(str(tmp_path / "missing.sqlite")).version is None
+
+    def test_taxonomy_index(self, taxdump_file, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        dbfile = str(tmp_path / "taxa.sqlite")
+        NCBITaxa(dbfile=dbfile, taxdump_file=str(taxdump_file))
+        ncbi = NCBITaxonomy(dbfile)
+        index = TaxonomyIndex.from_ete3(str(tmp_path / "ete3_index"), dbfile)
+        taxdump_index = TaxonomyIndex.from_taxdump(
+            str(tmp_path / "taxdump_index"), str(taxdump_file)
+        )
+        names = ["Clostridia", "BACTERIA", "Monera", "Bacillota", "Unknown"]
+        taxids = [1, 2, 1239, 186801, 1502, 12345]
+        for backend in [index, taxdump_index]:
+            assert backend.get_name_translator(names) == ncbi.get_name_translator(names)
+            # Only ascii letters are case-insensitive, non-ascii names match exactly
+            for name in ["Clostridium Ångström", "CLOSTRIDIUM Ångström"]:
+                assert backend.get_name_translator([name]) == {name: [1485]}
+            assert backend.get_name_translator(["clostridium ångström"]) == {}
+            assert backend.get_taxid_translator(taxids) == ncbi.get_taxid_translator(
+                taxids
+            )
+            assert backend.get_rank(taxids) == ncbi.get_rank(taxids)
+            assert backend.get_lineage(1502) == ncbi.get_lineage(1502)
+            with pytest.warns(UserWarning):
+                assert backend.get_lineage(12345) == [1, 131567, 2, 1239]
+            with pytest.raises(ValueError):
+                backend.get_lineage(999)
+
+    def test_from_taxids(self, taxdump_file, tmp_path):
+        TaxonomyIndex.from_taxdump(str(tmp_path / "index"), str(taxdump_file))
+        set_taxonomy(TaxonomyIndex(str(tmp_path / "index")))
+        try:
+            lineages = Lineage.from_taxids([1502, 1239, 1502])
+            assert lineages == [
+                Lineage.from_taxid(1502),
+                Lineage(Kingdom="Bacteria", Phylum="Firmicutes"),
+                Lineage.from_taxid(1502),
+            ]
+            assert lineages[0].Species == "Clostridium perfringens"
+            assert lineages[1].taxid == ("Phylum", 1239)
+        finally:
+            set_taxonomy(None)